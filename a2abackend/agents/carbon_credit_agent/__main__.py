@@ -12,10 +12,6 @@ import click
 # A2A server implementation
 from server.server import A2AServer
 
-# Agent and task manager
-from agents.carbon_credit_agent.agent import CarbonCreditAgent
-from agents.carbon_credit_agent.task_manager import CarbonCreditTaskManager
-
 # Agent metadata
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 
@@ -45,6 +41,13 @@ def main(host: str, port: int):
     """
     logger.info("Starting Carbon Credit Negotiation Agent...")
 
+    # Load .env and the heavy agent modules only once the CLI args are parsed
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    from agents.carbon_credit_agent.agent import CarbonCreditAgent
+    from agents.carbon_credit_agent.task_manager import CarbonCreditTaskManager
+
     # 1) Create the CarbonCreditAgent instance
     agent = CarbonCreditAgent()
     
@@ -52,9 +55,10 @@ def main(host: str, port: int):
     task_manager = CarbonCreditTaskManager(agent=agent)
 
     # 3) Define the agent's metadata for discovery
-    capabilities = AgentCapabilities(streaming=True, pushNotifications=False)
+    # All values are literals, so model_construct() skips Pydantic validation
+    capabilities = AgentCapabilities.model_construct(streaming=True, pushNotifications=False)
     
-    skill = AgentSkill(
+    skill = AgentSkill.model_construct(
         id="carbon_credit_negotiation",
         name="Carbon Credit Negotiation",
         description=(
@@ -70,7 +74,7 @@ def main(host: str, port: int):
         ]
     )
     
-    agent_card = AgentCard(
+    agent_card = AgentCard.model_construct(
         name="CarbonCreditAgent",
         description="Negotiates carbon credit purchases by finding the best deals from marketplace companies.",
         url=f"http://{host}:{port}/",
@@ -12,6 +12,7 @@
 # =============================================================================
 
 import logging
+from typing import TYPE_CHECKING
 
 # InMemoryTaskManager provides an in-memory store and locking for tasks
 from server.task_manager import InMemoryTaskManager
@@ -21,7 +22,9 @@ from models.request import SendTaskRequest, SendTaskResponse
 from models.task import Message, TaskStatus, TaskState, TextPart
 
 # The core business logic: CarbonCreditAgent with an async invoke() method
-from agents.carbon_credit_agent.agent import CarbonCreditAgent
+# (type-only import; __main__ constructs the agent)
+if TYPE_CHECKING:
+    from agents.carbon_credit_agent.agent import CarbonCreditAgent
 
 # Create a logger specific to this module
 logger = logging.getLogger(__name__)
@@ -42,7 +45,7 @@ class CarbonCreditTaskManager(InMemoryTaskManager):
     - CarbonCreditAgent.invoke() is asynchronous, but on_send_task()
       itself is also defined as async, so we await internal calls.
     """
-    def __init__(self, agent: CarbonCreditAgent):
+    def __init__(self, agent: "CarbonCreditAgent"):
         """
         Initialize the TaskManager with a CarbonCreditAgent instance.
 
@@ -50,7 +53,7 @@ class CarbonCreditTaskManager(InMemoryTaskManager):
             agent (CarbonCreditAgent): The core logic handler that knows how to
                                       process carbon credit negotiation requests.
         """
-        # Call the parent constructor to set up self.tasks and self.lock
+        # Call the parent constructor to set up self.tasks and the per-task locks
         super().__init__()
         # Store a reference to our CarbonCreditAgent for later use
         self.agent = agent
@@ -113,12 +116,8 @@ class CarbonCreditTaskManager(InMemoryTaskManager):
         )
 
         # Step 5: Update the task status to COMPLETED and append our reply
-        # Use the lock to avoid race conditions with other coroutines.
-        async with self.lock:
-            # Mark the task as done
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            # Add the agent's reply to the task's history
-            task.history.append(reply_message)
+        # update_task locks just this task, so other tasks are not blocked.
+        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), reply_message)
 
         # Step 6: Return a SendTaskResponse, containing the JSON-RPC id
         # (mirroring the request.id) and the updated Task model.
@@ -9,6 +9,7 @@
 # =============================================================================
 
 import logging                              # Built-in module to log info, warnings, errors
+import os                                   # os.urandom for child-agent session IDs
 from dotenv import load_dotenv              # For loading environment variables from a .env file
 
 load_dotenv()  # Read .env in project root so that GOOGLE_API_KEY (and others) are set
@@ -25,6 +26,7 @@ from google.genai import types
 
 # Helper to wrap our Python functions as “tools” for the LLM to call
 from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.tool_context import ToolContext
 
 # Utilities we wrote for agent discovery and HTTP connection:
 from utilities.discovery import DiscoveryClient
@@ -91,7 +93,7 @@ class GreetingAgent:
 
 
         # --- Tool 2: call_agent ---
-        async def call_agent(agent_name: str, message: str) -> str:
+        async def call_agent(agent_name: str, message: str, tool_context: ToolContext) -> str:
             """
             Given an agent_name string and a user message,
             find that agent’s URL, send the task, and return its reply.
@@ -128,8 +130,13 @@ class GreetingAgent:
                 )
             connector = self.connectors[key]
 
-            # Use a single session per greeting agent run (could be improved)
-            session_id = self.user_id
+            # Keep one child session per conversation via tool_context.state, so
+            # repeated calls continue the same child session (and its context)
+            # instead of every user sharing a single fixed session
+            state = tool_context.state
+            if "session_id" not in state:
+                state["session_id"] = os.urandom(16).hex()
+            session_id = state["session_id"]
 
             # Delegate the task and wait for the full Task object
             task = await connector.send_task(message, session_id=session_id)
@@ -222,4 +229,8 @@ class GreetingAgent:
             return ""
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
\ No newline at end of file
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
\ No newline at end of file
@@ -7,8 +7,9 @@
 # from low-level HTTP details and HTTP client setup.
 # =============================================================================
 
-import uuid                           # Standard library for generating unique IDs
+import os                             # os.urandom for unique task IDs
 import logging                        # Standard library for configurable logging
+import httpx                          # Async HTTP client (shared pool is injected)
 
 # Import our custom A2AClient which handles JSON-RPC task requests
 from client.client import A2AClient
@@ -28,18 +29,20 @@ class AgentConnector:
         client (A2AClient): HTTP client pointing at the agent's URL.
     """
 
-    def __init__(self, name: str, base_url: str):
+    def __init__(self, name: str, base_url: str, http_client: httpx.AsyncClient = None):
         """
         Initialize the connector for a specific remote agent.
 
         Args:
             name (str): Identifier for the agent (e.g., "TellTimeAgent").
             base_url (str): The HTTP endpoint (e.g., "http://localhost:10000").
+            http_client (httpx.AsyncClient): Optional shared pooled client so
+                connectors reuse keep-alive connections instead of opening one per call.
         """
         # Store the agent’s name for logging and reference
         self.name = name
         # Instantiate an A2AClient bound to the agent’s base URL
-        self.client = A2AClient(url=base_url)
+        self.client = A2AClient(url=base_url, http_client=http_client)
         # Log that the connector is ready for use
         logger.info(f"AgentConnector: initialized for {self.name} at {base_url}")
 
@@ -54,8 +57,8 @@ class AgentConnector:
         Returns:
             Task: The full Task object (including history) from the remote agent.
         """
-        # Generate a unique ID for this task using uuid4, hex form
-        task_id = uuid.uuid4().hex
+        # Generate a unique 128-bit hex ID for this task (uuid4-equivalent entropy)
+        task_id = os.urandom(16).hex()
         # Build the JSON-RPC payload matching TaskSendParams schema
         payload = {
             "id": task_id,
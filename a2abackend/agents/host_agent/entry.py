@@ -15,6 +15,8 @@ import click                                # Library for building CLI interface
 from utilities.discovery import DiscoveryClient
 # Shared A2A server implementation (Starlette + JSON-RPC)
 from server.server import A2AServer
+# Optional Gemini client warm-up at startup (PREWARM=1)
+from utilities.prewarm import prewarm_enabled, prewarm_llm
 # Pydantic models for defining agent metadata (AgentCard, etc.)
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 # Orchestrator implementation and its task manager
@@ -68,7 +70,7 @@ def main(host: str, port: int, registry: str):
         )
 
     # 2) Define the OrchestratorAgent's own metadata for discovery
-    capabilities = AgentCapabilities(streaming=False)
+    capabilities = AgentCapabilities(streaming=True)   # tasks/sendSubscribe streams partial replies
     skill = AgentSkill(
         id="orchestrate",                          # Unique skill identifier
         name="Orchestrate Tasks",                  # Human-friendly name
@@ -105,6 +107,13 @@ def main(host: str, port: int, registry: str):
         agent_card=orchestrator_card,
         task_manager=task_manager
     )
+    # Close the orchestrator's shared HTTP client when uvicorn shuts down
+    server.app.router.on_shutdown.append(orchestrator.aclose)
+    if prewarm_enabled():
+        # Runs on uvicorn's loop, so the first user turn reuses the warm client
+        async def _prewarm():
+            await prewarm_llm(orchestrator.llm_agent)
+        server.app.router.on_startup.append(_prewarm)
     server.start()
 
 
@@ -8,11 +8,17 @@
 # =============================================================================
 
 import os                           # Standard library for interacting with the operating system
-import uuid                         # For generating unique identifiers (e.g., session IDs)
+import asyncio                      # For running blocking cache lookups off the event loop
 import logging                      # Standard library for configurable logging
-import json                         # For persisting session history to disk
-from pathlib import Path            # Cross-platform path utilities
+import json                         # For (de)serializing semantic cache entries
+import re                           # Compiled patterns for the fast-path router
+import httpx                        # Shared pooled HTTP client for child-agent calls
+import importlib.util               # Detects the optional h2 package for HTTP/2
+import time                         # Monotonic clock for delegate-cache TTLs
+from collections import OrderedDict # LRU store for cached child-agent replies
 from dotenv import load_dotenv      # Utility to load environment variables from a .env file
+from opentelemetry import trace     # Spans around LLM runs and child-agent calls
+from opentelemetry import metrics   # Counter of fast-routed vs LLM turns
 
 # Load the .env file so that environment variables like GOOGLE_API_KEY
 # are available to the ADK client when creating LLMs
@@ -27,8 +33,8 @@ from google.adk.agents.llm_agent import LlmAgent
 from google.adk.tools.function_tool import FunctionTool
 # FunctionTool: wraps Python functions as LLM tools
 
-from google.adk.sessions import InMemorySessionService
-# InMemorySessionService: stores session state in memory (for simple demos)
+from utilities.local_session import LocalSessionService
+# LocalSessionService: in-process sessions, handed out without per-turn deep copies
 
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 # InMemoryMemoryService: optional conversation memory stored in RAM
@@ -39,6 +45,18 @@ from google.adk.artifacts import InMemoryArtifactService
 from google.adk.runners import Runner
 # Runner: orchestrates agent, sessions, memory, and tool invocation
 
+from google.adk.events import Event, EventActions
+# Event / EventActions: session history entries written for fast-routed turns
+
+from google.adk.agents.invocation_context import new_invocation_context_id
+# new_invocation_context_id: same invocation id format the Runner uses
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+# RunConfig: per-run settings; StreamingMode.SSE makes Gemini emit partial text events
+
+from google.adk.planners import BuiltInPlanner
+# BuiltInPlanner: carries Gemini's thinking config (ADK rejects it in generate_content_config)
+
 from google.adk.agents.readonly_context import ReadonlyContext
 # ReadonlyContext: passed to system prompt function to read context
 
@@ -51,13 +69,14 @@ from google.genai import types
 # -----------------------------------------------------------------------------
 # A2A server-side infrastructure
 # -----------------------------------------------------------------------------
-from server.task_manager import InMemoryTaskManager
-# InMemoryTaskManager: base class providing in-memory task storage and locking
+from server.task_manager import RedisTaskManager
+# RedisTaskManager: task storage in Redis when REDIS_URL is set, in memory otherwise
 
 from models.request import SendTaskRequest, SendTaskResponse
+from models.request import SendTaskStreamingRequest, SendTaskStreamingResponse
 # Data models for incoming task requests and outgoing responses
 
-from models.task import Message, TaskStatus, TaskState, TextPart
+from models.task import Message, TaskStatus, TaskState, TextPart, TaskStatusUpdateEvent
 # Message: encapsulates role+parts; TaskStatus/State: status enums; TextPart: text payload
 
 # -----------------------------------------------------------------------------
@@ -72,6 +91,241 @@ from models.agent import AgentCard
 # Set up module-level logger for debug/info messages
 logger = logging.getLogger(__name__)
 
+# Tracer for latency attribution (no-op unless an OpenTelemetry SDK/exporter is configured)
+tracer = trace.get_tracer(__name__)
+
+# Turns per route (fast / semantic_cache / llm), to track the fast-path hit rate
+meter = metrics.get_meter(__name__)
+route_counter = meter.create_counter(
+    "orchestrator.turns",
+    unit="1",
+    description="Orchestrator turns by route: fast-routed, semantic cache or LLM",
+)
+
+# orjson is optional; fall back to the stdlib encoder when it is missing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# -----------------------------------------------------------------------------
+# System prompt
+# -----------------------------------------------------------------------------
+# Kept constant (no discovered-agent list, no interpolation) so the exact same
+# prefix is sent on every turn and provider-side prompt caching can reuse it.
+# The LLM learns which agents exist through the _list_agents tool.
+# Routes are one terse line each: the prompt is prefilled on every turn, so
+# every token here is paid per request.
+ROOT_INSTRUCTION = """You are an Orchestrator. Delegate user intents to child agents with these tools:
+- _list_agents() -> names of the available child agents
+- _delegate_task(agent_name, message) -> send a text command to that agent
+- _delegate_tasks(agent_names, messages) -> send several independent commands at once, replies in order
+
+Call _list_agents() before delegating; only delegate to listed agents and skip routes whose agent is not listed.
+Choose the agent yourself and do not ask for details a child agent can look up or default.
+
+Routes (intent -> agent: message to send; "as is" = forward the user's text unchanged):
+- Time -> TellTimeAgent: as is
+- Greetings -> GreetingAgent: as is
+- Wallet balance, addresses -> WalletBalanceAgent: as is (public testnet RPCs, no API keys)
+- 'hedera payment agent', 'hedera payment/transfer', 'HBAR transfer', 'Send X HBAR to account 0.0.123', 'Check my HBAR balance' -> Hedera Payment Agent: as is
+- Other HBAR/ETH/MATIC transfers -> PaymentAgent: as is
+- Buy/purchase/get N credits now -> PaymentAgent: 'buy_carbon_credits(amount=N)', adding company_name if given
+- Prebook or future purchases; list/status/approve prebookings -> PrebookingAgent: as is (it validates companies itself)
+- CarbonCreditAgent:
+  * find credits at best price: as is
+  * show offers: 'list_offers(limit=10)'
+  * company details for X: 'get_company_details(company_name=X)'
+  * registered/all companies, companies making credits: 'get_registered_companies()'
+- IoTCarbonAgent:
+  * current device data: 'get_live_sensor_data()'
+  * credit predictions: 'predict_carbon_credits()'
+  * device status: 'get_device_status()'
+  * sequestration trends: 'analyze_sequestration_trends()'
+  * preparing for credits: 'get_company_preparation_advice()'
+  * companies generating credits now: 'get_live_generating_companies()'
+- Automation rules, status, workflows, schedules -> AutomationAgent: as is
+
+Keep conversation context across turns in the same session."""
+
+
+# -----------------------------------------------------------------------------
+# Tool declarations
+# -----------------------------------------------------------------------------
+class CachedFunctionTool(FunctionTool):
+    """
+    FunctionTool whose Gemini declaration is built once per process and
+    function. Plain FunctionTool re-inspects the signature and rebuilds the
+    schema on every LLM request; these tools never change at runtime.
+
+    ADK has no public hook for the declaration, so this overrides the private
+    FunctionTool._get_declaration (and reads _api_variant); google-adk is
+    pinned below 2.0 in pyproject.toml for that reason. Recheck this override
+    when raising the pin.
+    """
+
+    _declarations: dict = {}
+
+    def _get_declaration(self):
+        # Key on the underlying function so every orchestrator instance shares it
+        key = (getattr(self.func, "__func__", self.func), getattr(self, "_api_variant", None))
+        declaration = self._declarations.get(key)
+        if declaration is None:
+            declaration = super()._get_declaration()
+            self._declarations[key] = declaration
+        return declaration
+
+
+# -----------------------------------------------------------------------------
+# Delegate cache
+# -----------------------------------------------------------------------------
+# Child agents whose replies are read-only lookups and may be reused for an
+# identical message. Payment, prebooking, automation, wallet, time and live IoT
+# agents are deliberately absent: their replies have side effects or go stale.
+# Only command-form messages (e.g. "list_offers(limit=10)") are cached or
+# shared: free-text follow-ups depend on the child's per-session context, so
+# another session must never be served their reply.
+CACHEABLE_AGENTS = frozenset({"CarbonCreditAgent"})
+# Delegations to these agents change offer stock, so they drop every cached
+# reply (and any fetch already in flight) before the next lookup
+CACHE_INVALIDATING_AGENTS = frozenset({"PaymentAgent"})
+# Kept within CarbonCreditAgent's own 5 s offer cache, so the orchestrator
+# never adds staleness on top of the child's
+DELEGATE_CACHE_TTL = 5.0       # seconds a cached child reply stays valid
+DELEGATE_CACHE_MAXSIZE = 512   # LRU capacity
+
+# Session ids seen recently are assumed to still exist, so a turn skips the
+# get_session existence check (Runner.run_async loads the session anyway)
+KNOWN_SESSION_TTL = 60.0       # seconds before existence is checked again
+KNOWN_SESSION_MAXSIZE = 1024   # LRU capacity
+
+# -----------------------------------------------------------------------------
+# Fast-path router
+# -----------------------------------------------------------------------------
+# Exact phrasings whose route is never in doubt, matched against the whole
+# normalized query. Each entry is (pattern, agent, message to send); a message
+# of None forwards the user's text unchanged. Enabled with ORCH_FAST_ROUTER=1.
+FAST_ROUTES = (
+    (r"what time is it( now)?|what(?:'s| is) the( current)? time( now)?", "TellTimeAgent", None),
+    (r"(show|list)( me)?( the)?( current)?( carbon credit)? offers", "CarbonCreditAgent", "list_offers(limit=10)"),
+    (r"(show|list)( me)?( all)?( the)?( registered)? companies", "CarbonCreditAgent", "get_registered_companies()"),
+    (r"show( current)? iot device data", "IoTCarbonAgent", "get_live_sensor_data()"),
+    (r"show iot device status", "IoTCarbonAgent", "get_device_status()"),
+    (r"(list|show)( my| all)? prebookings", "PrebookingAgent", None),
+    (r"(check )?automation status|check automation", "AutomationAgent", None),
+    (r"(list|show)( all)? automation rules", "AutomationAgent", None),
+)
+# One alternation with a named group per route, so a single match picks the route
+_FAST_ROUTER = re.compile(
+    "|".join(f"(?P<r{i}>{pattern})" for i, (pattern, _, _) in enumerate(FAST_ROUTES))
+)
+
+# Delegated messages in command form, e.g. "buy_carbon_credits(amount=5)" or
+# "list_offers(limit=10)": the child's reply already is the answer, so it is
+# returned to the user without another Gemini pass to summarize it
+_COMMAND_RE = re.compile(r"[a-z_]+\(.*\)")
+
+# -----------------------------------------------------------------------------
+# Gemini error classification
+# -----------------------------------------------------------------------------
+# One pass over the error text; the matched phrase (lowercased) picks the
+# (log level, log line, user reply) for _handle_gemini_error
+_ERR_RX = re.compile(r"(503 UNAVAILABLE|overloaded|400 Bad Request|rate limit)", re.IGNORECASE)
+_OVERLOADED_ERR = (
+    logging.WARNING,
+    "⚠️ Gemini API is overloaded - Orchestrator",
+    "The AI service is temporarily overloaded. Please try again in a few moments.",
+)
+_ERR_MSGS = {
+    "503 unavailable": _OVERLOADED_ERR,
+    "overloaded": _OVERLOADED_ERR,
+    "400 bad request": (
+        logging.ERROR,
+        "❌ Bad request to Gemini API - Orchestrator",
+        "Invalid request format. Please check your input.",
+    ),
+    "rate limit": (
+        logging.WARNING,
+        "⏰ Rate limit exceeded - Orchestrator",
+        "Too many requests. Please wait before trying again.",
+    ),
+}
+
+# -----------------------------------------------------------------------------
+# Admission control
+# -----------------------------------------------------------------------------
+# Reply for turns rejected because the backlog is full (see OrchestratorTaskManager)
+OVERLOADED_REPLY = "The orchestrator is handling too many requests right now. Please try again shortly."
+
+# -----------------------------------------------------------------------------
+# Optional semantic response cache (GPTCache)
+# -----------------------------------------------------------------------------
+try:
+    from gptcache import Cache
+    from gptcache.adapter.api import init_similar_cache, get as gptcache_get, put as gptcache_put
+    GPTCACHE_AVAILABLE = True
+except ImportError:
+    GPTCACHE_AVAILABLE = False
+
+
+class SemanticCache:
+    """
+    🧠 Caches final orchestrator replies keyed by query similarity, so a
+    repeated or near-identical question skips the Gemini round trip.
+
+    Enabled with ORCH_SEMANTIC_CACHE=1 (and gptcache installed). Each entry
+    records the session it came from and is only served back to that same
+    session, so replies never leak across users.
+    """
+
+    def __init__(self):
+        self.enabled = GPTCACHE_AVAILABLE and os.getenv("ORCH_SEMANTIC_CACHE") == "1"
+        self._cache_obj = None
+        if self.enabled:
+            data_dir = os.getenv("ORCH_SEMANTIC_CACHE_DIR", ".orch_semantic_cache")
+            self._cache_obj = Cache()
+            init_similar_cache(data_dir=data_dir, cache_obj=self._cache_obj)
+            logger.info("Semantic response cache enabled at %s", data_dir)
+
+    async def get(self, session_id: str, query: str) -> str | None:
+        """Return the cached reply for a similar query in this session, if any."""
+        if not self.enabled:
+            return None
+        try:
+            # Embedding + similarity search is CPU work; keep it off the event loop
+            hit = await asyncio.to_thread(gptcache_get, query, cache_obj=self._cache_obj)
+            if not hit:
+                return None
+            entry = _loads(hit)
+            if entry.get("session_id") != session_id:
+                return None
+            return entry.get("text")
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+
+    async def put(self, session_id: str, query: str, text: str) -> None:
+        """Store the final reply for this query and session."""
+        if not self.enabled or not text:
+            return
+        try:
+            entry = _dumps({"session_id": session_id, "text": text})
+            await asyncio.to_thread(gptcache_put, query, entry, cache_obj=self._cache_obj)
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+
 
 class OrchestratorAgent:
     """
@@ -82,13 +336,35 @@ class OrchestratorAgent:
     # Define supported MIME types for input/output
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
-    def __init__(self, agent_cards: list[AgentCard]):
-        # Build one AgentConnector per discovered AgentCard
-        # agent_cards is a list of AgentCard objects returned by discovery
-        self.connectors = {
-            card.name: AgentConnector(card.name, card.url)
-            for card in agent_cards
-        }
+    def __init__(self, agent_cards: list[AgentCard], session_service=None):
+        # agent_cards is a list of AgentCard objects returned by discovery;
+        # connectors are built lazily on first delegation (see _get_connector).
+        # session_service overrides the default chosen by _build_session_service
+        self._agent_cards = {card.name: card for card in agent_cards}
+        # Discovery is fixed for the process lifetime, so _list_agents' reply is built once
+        self._agent_names = list(self._agent_cards)
+        self.connectors: dict[str, AgentConnector] = {}
+
+        # (agent_name, normalized message) -> (expires_at, reply text), LRU-ordered
+        self._delegate_cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        # Bumped on every invalidation; a fetch started under an older generation isn't stored
+        self._delegate_cache_gen = 0
+        # session_id -> time until which it is known to exist, LRU-ordered
+        self._known_sessions: OrderedDict[str, float] = OrderedDict()
+        # Same key -> child call currently in flight, shared by concurrent identical requests
+        self._delegate_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+        # One pooled HTTP client shared by every connector, so child-agent calls
+        # reuse keep-alive connections instead of a new TCP setup per task.
+        # With h2 installed (the http2 extra), concurrent calls to the same
+        # child multiplex over one connection
+        self._http = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+            # Child replies can take a while (they run their own LLM), but a
+            # child that is down should fail the connect quickly
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
 
         # Build the internal LLM agent with our custom tools and instructions
         self._agent = self._build_agent()
@@ -101,29 +377,54 @@ class OrchestratorAgent:
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=session_service or self._build_session_service(),
             memory_service=InMemoryMemoryService(),
         )
 
+        # Run settings for invoke() (complete events only) and stream() (partial text too)
+        self._run_config = RunConfig()
+        self._stream_run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+
+        # Optional similarity cache of final replies (off unless ORCH_SEMANTIC_CACHE=1)
+        self._semantic_cache = SemanticCache()
+
+        # Optional deterministic routing for exact commands (off unless ORCH_FAST_ROUTER=1)
+        self._fast_router_enabled = os.getenv("ORCH_FAST_ROUTER") == "1"
+
+    @property
+    def llm_agent(self) -> LlmAgent:
+        """The underlying ADK LlmAgent (e.g. for startup warm-up)."""
+        return self._agent
+
+    @staticmethod
+    def _build_session_service():
+        """
+        Sessions live in Redis when REDIS_URL is set, so several orchestrator
+        replicas can serve the same conversation; otherwise in process memory
+        (LocalSessionService, which unlike InMemorySessionService does not
+        deep-copy the whole conversation on every turn).
+        """
+        redis_url = os.getenv("REDIS_URL")
+        if redis_url:
+            from utilities.redis_session import RedisSessionService
+            logger.info("Orchestrator sessions stored in Redis")
+            return RedisSessionService(redis_url)
+        return LocalSessionService()
+
     def _handle_gemini_error(self, error: Exception) -> str:
         """
         🔧 Handle Gemini API errors with proper logging and user-friendly messages.
         """
         error_str = str(error)
-        logger.error(f"🚨 Gemini API Error in Orchestrator: {error_str}")
-        
-        if "503 UNAVAILABLE" in error_str or "overloaded" in error_str.lower():
-            logger.warning("⚠️ Gemini API is overloaded - Orchestrator")
-            return "The AI service is temporarily overloaded. Please try again in a few moments."
-        elif "400 Bad Request" in error_str:
-            logger.error("❌ Bad request to Gemini API - Orchestrator")
-            return "Invalid request format. Please check your input."
-        elif "rate limit" in error_str.lower():
-            logger.warning("⏰ Rate limit exceeded - Orchestrator")
-            return "Too many requests. Please wait before trying again."
-        else:
-            logger.error(f"❌ Unknown Gemini API error in Orchestrator: {error_str}")
+        logger.error("🚨 Gemini API Error in Orchestrator: %s", error_str)
+
+        match = _ERR_RX.search(error_str)
+        if match is None:
+            logger.error("❌ Unknown Gemini API error in Orchestrator: %s", error_str)
             return "An unexpected error occurred. Please try again later."
+        level, log_line, reply = _ERR_MSGS[match.group(1).lower()]
+        logger.log(level, log_line)
+        return reply
 
     def _build_agent(self) -> LlmAgent:
         """
@@ -132,103 +433,98 @@ class OrchestratorAgent:
         - Agent name/description
         - System instruction callback
         - Available tool functions
+        - Generation limits: the orchestrator mostly emits tool calls and
+          relays child replies, so the visible output is capped
+          (ORCH_MAX_OUTPUT_TOKENS) and sampling kept near-deterministic.
+          On gemini-2.5-flash thinking tokens count against the same
+          max_output_tokens, so thinking is bounded too
+          (ORCH_THINKING_BUDGET, default 1024; 0 disables it) and the cap
+          sent to Gemini is output + thinking budget. Otherwise a long
+          routing turn could spend the whole cap thinking and end with
+          MAX_TOKENS and an empty reply.
         """
+        max_output_tokens = int(os.getenv("ORCH_MAX_OUTPUT_TOKENS", "2048"))
+        thinking_budget = int(os.getenv("ORCH_THINKING_BUDGET", "1024"))
+        planner = BuiltInPlanner(
+            thinking_config=types.ThinkingConfig(thinking_budget=thinking_budget)
+        )
+
         return LlmAgent(
             model="gemini-2.5-flash",    # Specify Gemini model version
             name="orchestrator_agent",          # Human identifier for this agent
             description="Delegates user queries to child A2A agents based on intent.",
             instruction=self._root_instruction,  # Function providing system prompt text
+            generate_content_config=types.GenerateContentConfig(
+                temperature=0.2,
+                max_output_tokens=max_output_tokens + max(thinking_budget, 0),
+            ),
+            planner=planner,
             tools=[
-                FunctionTool(self._list_agents),               # Tool 1: list available child agents
-                FunctionTool(self._delegate_task),             # Tool 2: call a child agent
+                CachedFunctionTool(self._list_agents),         # Tool 1: list available child agents
+                CachedFunctionTool(self._delegate_task),       # Tool 2: call a child agent
+                CachedFunctionTool(self._delegate_tasks),      # Tool 3: call several child agents concurrently
             ],
         )
 
     def _root_instruction(self, context: ReadonlyContext) -> str:
         """
-        System prompt function: returns instruction text for the LLM,
-        including which tools it can use and a list of child agents.
-        """
-        # Build dynamic agent summary and delegation rules
-        names = set(self.connectors.keys())
-        lines: list[str] = []
-
-        lines.append("You are an Orchestrator. Use tools to delegate user intents to child agents.\n")
-        lines.append("Tools:\n- _list_agents() -> list available child agents\n- _delegate_task(agent_name, message) -> send a text command to that agent\n")
-        lines.append("IMPORTANT ROUTING RULES:\n")
-        lines.append("- For carbon credit purchases ('buy', 'purchase', 'get'): delegate to PaymentAgent\n")
-        lines.append("- For FUTURE carbon credit purchases ('prebook', 'create prebooking'): delegate to PrebookingAgent\n")
-        lines.append("- PaymentAgent handles immediate purchases with real blockchain transactions\n")
-        lines.append("- PrebookingAgent handles future purchases with approval workflows\n")
-
-        
-        lines.append("IMPORTANT ROUTING RULES:\n")
-        lines.append("- For carbon credit purchases ('buy', 'purchase', 'get'): delegate to PaymentAgent\n")
-        lines.append("- For FUTURE carbon credit purchases ('prebook', 'create prebooking'): delegate to PrebookingAgent\n")
-        lines.append("- PaymentAgent handles immediate purchases with real blockchain transactions\n")
-        lines.append("- PrebookingAgent handles future purchases with approval workflows\n")
-
-        # Agent-specific routing guidance
-        lines.append("Routing rules (auto-choose agent; do not ask for data that child agents can derive):")
-        if "TellTimeAgent" in names:
-            lines.append("- Time requests -> TellTimeAgent (e.g., 'What time is it?').")
-        if "GreetingAgent" in names:
-            lines.append("- Greetings/salutations -> GreetingAgent.")
-        if "WalletBalanceAgent" in names:
-            lines.append("- 'Check my wallet balance' or addresses -> WalletBalanceAgent. It uses public testnet RPCs; no API keys required.")
-        if "Hedera Payment Agent" in names:
-            lines.append("- Hedera HBAR transfers -> Hedera Payment Agent:")
-            lines.append("  * When user mentions 'hedera payment agent', 'hedera payment', 'hedera transfer', or 'HBAR transfer' -> delegate to Hedera Payment Agent.")
-            lines.append("  * Direct HBAR transfers: 'Send X HBAR to account 0.0.123' -> delegate to Hedera Payment Agent.")
-            lines.append("  * Balance checks: 'Check my HBAR balance' -> delegate to Hedera Payment Agent.")
-        if "PaymentAgent" in names:
-            lines.append("- Direct HBAR/ETH/MATIC transfers -> PaymentAgent (text commands like 'Send 1 HBAR to account 0.0.123').")
-            lines.append("- Carbon credit purchases -> PaymentAgent:")
-            lines.append("  * When user says 'buy N credits' or 'purchase credits' -> delegate to PaymentAgent with 'buy_carbon_credits(amount=N)' (optionally include company_name).")
-            lines.append("  * PaymentAgent will get company details from CarbonCreditAgent, process payment, and record purchase.")
-        if "CarbonCreditAgent" in names:
-            lines.append("- Carbon credits marketplace info -> CarbonCreditAgent:")
-            lines.append("  * Discovery: 'Find 100 carbon credits at best price' -> delegate text unchanged.")
-            lines.append("  * Quick list: 'show offers' -> delegate 'list_offers(limit=10)'.")
-            lines.append("  * Company details: 'get company details for X' -> delegate 'get_company_details(company_name=X)'.")
-            lines.append("  * Company registration: 'show registered companies', 'list companies making carbon credits' -> delegate 'get_registered_companies()'.")
-            lines.append("  * Company details: 'which companies are registered', 'show all companies' -> delegate 'get_registered_companies()'.")
-        if "IoTCarbonAgent" in names:
-            lines.append("- IoT carbon sequestration -> IoTCarbonAgent:")
-            lines.append("  * Live data: 'show current IoT device data' -> delegate 'get_live_sensor_data()'.")
-            lines.append("  * Predictions: 'predict carbon credits for next 24 hours' -> delegate 'predict_carbon_credits()'.")
-            lines.append("  * Device status: 'show IoT device status' -> delegate 'get_device_status()'.")
-            lines.append("  * Trends: 'analyze carbon sequestration trends' -> delegate 'analyze_sequestration_trends()'.")
-            lines.append("  * Company advice: 'help me prepare for carbon credits' -> delegate 'get_company_preparation_advice()'.")
-            lines.append("  * Live companies: 'which companies are generating carbon credits now', 'show companies generating live', 'get live generating companies' -> delegate 'get_live_generating_companies()'.")
-        if "PrebookingAgent" in names:
-            lines.append("- Carbon credit prebooking -> PrebookingAgent:")
-            lines.append("  * Prebooking requests: 'prebook X credits from CompanyName', 'create prebooking for CompanyName' -> delegate text unchanged.")
-            lines.append("  * Prebooking management: 'list prebookings', 'get prebooking status', 'approve prebooking' -> delegate text unchanged.")
-            lines.append("  * Let PrebookingAgent handle company validation and suggestions internally.")
-        if "AutomationAgent" in names:
-            lines.append("- Automation and workflows -> AutomationAgent:")
-            lines.append("  * Rule management: 'list automation rules', 'enable automation', 'disable automation' -> delegate text unchanged.")
-            lines.append("  * Automation status: 'automation status', 'check automation' -> delegate text unchanged.")
-            lines.append("  * Workflow creation: 'create automation rule', 'add automation' -> delegate text unchanged.")
-            lines.append("  * Scheduled tasks: 'schedule task', 'create schedule' -> delegate text unchanged.")
-
-        lines.append("\nGeneral rules:")
-        lines.append("- Maintain conversation context across turns using the same session.")
-        lines.append("- Prefer not to re-ask for details that a child agent can compute or look up (DB, discovery, or defaults).")
-
-        # Append discovered agents list
-        agent_list = "\n".join(f"- {name}" for name in self.connectors)
-        lines.append("\nDiscovered agents:\n" + agent_list)
-
-        return "\n".join(lines)
+        System prompt function: returns instruction text for the LLM.
+        The text is the constant ROOT_INSTRUCTION, so every turn sends the
+        same bytes and the prompt prefix stays cacheable on the provider
+        side; discovered agents are reported by the _list_agents tool.
+        """
+        return ROOT_INSTRUCTION
+
+    def _fast_route(self, query: str) -> tuple[str, str] | None:
+        """
+        Return (agent_name, message) when the query is one of FAST_ROUTES'
+        exact phrasings and that agent is registered; None means the LLM
+        should route it.
+        """
+        if not self._fast_router_enabled:
+            return None
+        match = _FAST_ROUTER.fullmatch(query.strip().lower().rstrip("?.! "))
+        if match is None:
+            return None
+        # The outer named group closes last, so lastgroup names the route
+        _, agent_name, message = FAST_ROUTES[int(match.lastgroup[1:])]
+        if agent_name not in self._agent_cards:
+            return None
+        return agent_name, message if message is not None else query
+
+    def _get_connector(self, agent_name: str) -> AgentConnector:
+        """
+        Return the (memoized) AgentConnector for a discovered agent,
+        creating it on first use with the shared HTTP client. Also the name
+        check: raises ValueError for an agent that was not discovered.
+        """
+        # Warm path: one dict lookup both validates the name and finds the connector
+        connector = self.connectors.get(agent_name)
+        if connector is None:
+            card = self._agent_cards.get(agent_name)
+            if card is None:
+                raise ValueError(f"Unknown agent: {agent_name}")
+            connector = AgentConnector(card.name, card.url, http_client=self._http)
+            self.connectors[agent_name] = connector
+        return connector
+
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client and, when it holds connections (Redis),
+        the session service; call on process shutdown.
+        """
+        await self._http.aclose()
+        session_aclose = getattr(self._runner.session_service, "aclose", None)
+        if session_aclose is not None:
+            await session_aclose()
 
     def _list_agents(self) -> list[str]:
         """
         Tool function: returns the list of child-agent names currently registered.
-        Called by the LLM when it wants to discover available agents.
+        Call this before delegating to learn which agents are available;
+        only names returned here are valid for _delegate_task.
         """
-        return list(self.connectors.keys())
+        return self._agent_names
 
     async def _delegate_task(
         self,
@@ -241,26 +537,143 @@ class OrchestratorAgent:
         (via its AgentConnector), waits for the response, and returns the
         text of the last reply.
         """
-        # Validate agent_name exists
-        if agent_name not in self.connectors:
-            raise ValueError(f"Unknown agent: {agent_name}")
-        connector = self.connectors[agent_name]
+        # Validates agent_name (raises for unknown agents)
+        connector = self._get_connector(agent_name)
+        if _COMMAND_RE.fullmatch(message.strip()):
+            # End the turn on this tool's result instead of a summarizing LLM call
+            tool_context.actions.skip_summarization = True
+        return await self._send_to_agent(connector, message, self._child_session_id(tool_context))
+
+    async def _delegate_tasks(
+        self,
+        agent_names: list[str],
+        messages: list[str],
+        tool_context: ToolContext
+    ) -> list[str]:
+        """
+        Tool function: sends messages[i] to agent_names[i] for every i, all at
+        once, and returns the reply texts in the same order. Use it instead of
+        several _delegate_task calls when the requests do not depend on each
+        other's replies. A call that fails yields an "Error from <agent>: ..."
+        entry instead of failing the others.
+        """
+        if len(agent_names) != len(messages):
+            raise ValueError("agent_names and messages must have the same length")
+        # Validate every name before sending anything
+        connectors = [self._get_connector(agent_name) for agent_name in agent_names]
+
+        session_id = self._child_session_id(tool_context)
+        # Child round trips overlap, so the turn waits for the slowest one only
+        results = await asyncio.gather(
+            *(
+                self._send_to_agent(connector, message, session_id)
+                for connector, message in zip(connectors, messages)
+            ),
+            return_exceptions=True,
+        )
+        replies = []
+        for agent_name, result in zip(agent_names, results):
+            if isinstance(result, Exception):
+                logger.error("Delegation to %s failed: %s", agent_name, result)
+                replies.append(f"Error from {agent_name}: {result}")
+            else:
+                replies.append(result)
+        return replies
 
-        # Ensure session_id persists across tool calls via tool_context.state
+    @staticmethod
+    def _child_session_id(tool_context: ToolContext) -> str:
+        """
+        Session id used for child-agent calls; persists across tool calls
+        via tool_context.state.
+        """
+        # ADK's State has no setdefault; one get() covers the common hit
         state = tool_context.state
-        if "session_id" not in state:
-            state["session_id"] = str(uuid.uuid4())
-        session_id = state["session_id"]
+        session_id = state.get("session_id")
+        if session_id is None:
+            # 128 random bits as hex; cheaper than building a UUID object
+            session_id = state["session_id"] = os.urandom(16).hex()
+        return session_id
+
+    async def _send_to_agent(self, connector: AgentConnector, message: str, session_id: str) -> str:
+        """
+        Send one message to a child agent and return the text of its last
+        reply, serving read-only requests from the delegate cache when fresh.
+        """
+        agent_name = connector.name
+        if agent_name in CACHE_INVALIDATING_AGENTS:
+            # Invalidate on both sides of the call: lookups racing the purchase
+            # must not repopulate the cache with pre-purchase stock
+            self._invalidate_delegate_cache()
+            try:
+                return await self._fetch_child_reply(connector, message, session_id, None)
+            finally:
+                self._invalidate_delegate_cache()
+
+        command = message.strip()
+        if agent_name not in CACHEABLE_AGENTS or not _COMMAND_RE.fullmatch(command):
+            return await self._fetch_child_reply(connector, message, session_id, None)
+
+        # Reuse a recent reply for the same read-only command
+        cache_key = (agent_name, command.lower())
+        cached = self._delegate_cache.get(cache_key)
+        if cached is not None and cached[0] > time.monotonic():
+            self._delegate_cache.move_to_end(cache_key)
+            return cached[1]
+
+        # Concurrent turns sending the same read-only command share one child call
+        pending = self._delegate_inflight.get(cache_key)
+        if pending is None:
+            pending = asyncio.ensure_future(
+                self._fetch_child_reply(connector, message, session_id, cache_key)
+            )
+            self._delegate_inflight[cache_key] = pending
+            # Only drop our own entry: after an invalidation the key may hold a newer fetch
+            pending.add_done_callback(
+                lambda fut: self._delegate_inflight.get(cache_key) is fut
+                and self._delegate_inflight.pop(cache_key)
+            )
+        # Shield so one turn being cancelled does not cancel the shared call
+        return await asyncio.shield(pending)
+
+    def _invalidate_delegate_cache(self) -> None:
+        """
+        Drop cached child replies and detach in-flight fetches, so the next
+        lookup goes to the child agent.
+        """
+        self._delegate_cache.clear()
+        self._delegate_inflight.clear()
+        self._delegate_cache_gen += 1
+
+    async def _fetch_child_reply(
+        self,
+        connector: AgentConnector,
+        message: str,
+        session_id: str,
+        cache_key: tuple[str, str] | None,
+    ) -> str:
+        """
+        Send the task to the child agent and return the text of its last
+        reply, storing it in the delegate cache under cache_key if given.
+        """
+        generation = self._delegate_cache_gen
 
         # Delegate task asynchronously and await Task result
-        child_task = await connector.send_task(message, session_id)
+        with tracer.start_as_current_span("orchestrator.child_send_task") as span:
+            span.set_attribute("agent", connector.name)
+            span.set_attribute("message.length", len(message))
+            child_task = await connector.send_task(message, session_id)
 
         # Extract text from the last history entry if available
+        text = ""
         if child_task.history and len(child_task.history) > 1:
-            return child_task.history[-1].parts[0].text
-        return ""
-
+            text = child_task.history[-1].parts[0].text
 
+        if cache_key is not None and text and generation == self._delegate_cache_gen:
+            self._delegate_cache[cache_key] = (time.monotonic() + DELEGATE_CACHE_TTL, text)
+            self._delegate_cache.move_to_end(cache_key)
+            if len(self._delegate_cache) > DELEGATE_CACHE_MAXSIZE:
+                self._delegate_cache.popitem(last=False)
+        return text
 
     async def invoke(self, query: str, session_id: str) -> str:
         """
@@ -280,6 +693,47 @@ class OrchestratorAgent:
         in the Google ADK code 
         https://github.com/google/adk-python/commit/1804ca39a678433293158ec066d44c30eeb8e23b
 
+        """
+        response_text = ""
+        async for update in self._run_turn(query, session_id, streaming=False):
+            if update["is_task_complete"]:
+                response_text = update["content"]
+        return response_text
+
+    async def stream(self, query: str, session_id: str):
+        """
+        🌀 Streams the reply while Gemini generates it:
+        yields {"is_task_complete": False, "content": <text chunk>} for each
+        partial chunk, then {"is_task_complete": True, "content": <full reply>}.
+        """
+        async for update in self._run_turn(query, session_id, streaming=True):
+            yield update
+
+    async def invoke_many(self, queries: list[tuple[str, str]]) -> list[str]:
+        """
+        Run several (query, session_id) turns concurrently and return their
+        replies in order. Independent sessions overlap their Gemini and
+        child-agent round trips on the shared clients instead of queueing.
+        """
+        return list(await asyncio.gather(
+            *(self.invoke(query, session_id) for query, session_id in queries)
+        ))
+
+    async def _ensure_session(self, session_id: str) -> None:
+        """
+        Create the ADK session on first use. Runner.run_async loads the session
+        itself, so a recently seen id skips the extra get_session (a deep
+        copy in memory, a round trip with Redis).
+        """
+        expires_at = self._known_sessions.get(session_id)
+        if expires_at is not None and expires_at > time.monotonic():
+            self._known_sessions.move_to_end(session_id)
+            return
+        await self._load_session(session_id)
+
+    async def _load_session(self, session_id: str):
+        """
+        Fetch the ADK session, creating it if missing, and mark the id as known.
         """
         # Attempt to reuse an existing session
         session = await self._runner.session_service.get_session(
@@ -296,44 +750,207 @@ class OrchestratorAgent:
                 state={}
             )
 
-        # Wrap the user query in a types.Content message
+        self._known_sessions[session_id] = time.monotonic() + KNOWN_SESSION_TTL
+        self._known_sessions.move_to_end(session_id)
+        if len(self._known_sessions) > KNOWN_SESSION_MAXSIZE:
+            self._known_sessions.popitem(last=False)
+        return session
+
+    async def _fast_turn(self, query: str, session_id: str, agent_name: str, message: str) -> str:
+        """
+        Run a fast-routed command without the LLM, keeping the session as the
+        LLM path would: the child reply goes to the same child session
+        (state["session_id"]) and both turns are appended as session events.
+        """
+        session = await self._load_session(session_id)
+        session_service = self._runner.session_service
+
+        # Same child session id _delegate_task uses; a new one is persisted
+        # through the user event's state_delta
+        state_delta = {}
+        child_session_id = session.state.get("session_id")
+        if child_session_id is None:
+            child_session_id = state_delta["session_id"] = os.urandom(16).hex()
+
+        invocation_id = new_invocation_context_id()
+        await session_service.append_event(session, Event(
+            invocation_id=invocation_id,
+            author="user",
+            content=types.Content(role="user", parts=[types.Part(text=query)]),
+            actions=EventActions(state_delta=state_delta),
+        ))
+
+        text = await self._send_to_agent(self._get_connector(agent_name), message, child_session_id)
+
+        await session_service.append_event(session, Event(
+            invocation_id=invocation_id,
+            author=self._agent.name,
+            content=types.Content(role="model", parts=[types.Part(text=text)]),
+        ))
+        return text
+
+    async def _run_turn(self, query: str, session_id: str, streaming: bool):
+        """
+        Shared body of invoke() and stream(): runs one user turn through the
+        Runner and yields stream-style updates, ending with the full reply.
+        """
+        # Nothing to answer: don't spend a session lookup or a Gemini call
+        query = query.strip()
+        if not query:
+            yield {"is_task_complete": True, "content": ""}
+            return
+
+        # Exact commands go straight to their child agent, skipping the Gemini
+        # routing call
+        route = self._fast_route(query)
+        if route is not None:
+            agent_name, message = route
+            logger.info("Fast-routed query to %s for session %s", agent_name, session_id)
+            route_counter.add(1, {"route": "fast"})
+            text = await self._fast_turn(query, session_id, agent_name, message)
+            yield {"is_task_complete": True, "content": text}
+            return
+
+        # Serve a cached reply for a similar earlier question in this session
+        cached = await self._semantic_cache.get(session_id, query)
+        if cached is not None:
+            logger.info("Semantic cache hit for session %s", session_id)
+            route_counter.add(1, {"route": "semantic_cache"})
+            yield {"is_task_complete": True, "content": cached}
+            return
+
+        route_counter.add(1, {"route": "llm"})
+
+        # Make sure the session exists, unless it was seen moments ago
+        await self._ensure_session(session_id)
+
+        # Wrap the user query in a types.Content message (Part(text=...) is
+        # what Part.from_text builds, minus the extra classmethod call)
         content = types.Content(
             role="user",
-            parts=[types.Part.from_text(text=query)]
+            parts=[types.Part(text=query)]
         )
 
-        # 🚀 Run the agent using the Runner and collect the last event
+        # 🚀 Run the agent using the Runner; partial events (SSE mode only)
+        # are forwarded as they arrive, complete events are kept as last_event
         last_event = None
-        async for event in self._runner.run_async(
-            user_id=self._user_id,
-            session_id=session.id,
-            new_message=content
-        ):
-            last_event = event
+        delegated = False
+        # One span per LLM run (prefill, decode and tool calls); child calls nest under it
+        with tracer.start_as_current_span("orchestrator.llm") as span:
+            span.set_attribute("session_id", session_id)
+            span.set_attribute("query.length", len(query))
+            span.set_attribute("streaming", streaming)
+            async for event in self._runner.run_async(
+                user_id=self._user_id,
+                session_id=session_id,
+                new_message=content,
+                run_config=self._stream_run_config if streaming else self._run_config,
+            ):
+                if event.partial:
+                    if event.content and event.content.parts:
+                        # Each delta is forwarded as-is, never concatenated into a
+                        # growing string; the full reply comes from the final event
+                        parts = event.content.parts
+                        if len(parts) == 1:
+                            delta = parts[0].text
+                        else:
+                            delta = "".join(p.text for p in parts if p.text)
+                        if delta:
+                            yield {"is_task_complete": False, "content": delta}
+                    continue
+                # Replies built from child agents (time, balances, payments...) go stale
+                # or have side effects, so only self-contained answers are cacheable
+                if any(call.name in ("_delegate_task", "_delegate_tasks") for call in event.get_function_calls()):
+                    delegated = True
+                last_event = event
 
         # 🧹 Fallback: return empty string if something went wrong
         if not last_event or not last_event.content or not last_event.content.parts:
-            return ""
+            yield {"is_task_complete": True, "content": ""}
+            return
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            response_text = parts[0].text or ""
+        else:
+            response_text = "\n".join(p.text for p in parts if p.text)
+        if not response_text and last_event.actions.skip_summarization:
+            # The turn ended on a command delegation: the child's reply is the answer
+            response_text = "\n".join(
+                r.response["result"] for r in last_event.get_function_responses()
+                if r.response and isinstance(r.response.get("result"), str)
+            )
+        if not delegated:
+            await self._semantic_cache.put(session_id, query, response_text)
+        yield {"is_task_complete": True, "content": response_text}
 
 
-class OrchestratorTaskManager(InMemoryTaskManager):
+class OrchestratorTaskManager(RedisTaskManager):
     """
     🪄 TaskManager wrapper: exposes OrchestratorAgent.invoke() over the
     A2A JSON-RPC `tasks/send` endpoint, handling in-memory storage and
     response formatting.
     """
     def __init__(self, agent: OrchestratorAgent):
-        super().__init__()       # Initialize base in-memory storage
+        super().__init__(redis_url=os.getenv("REDIS_URL"))  # Redis if configured, else in memory
         self.agent = agent       # Store our orchestrator logic
+        # (user_text, session_id) -> in-flight invoke, for request coalescing
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        # Admission control: bounded concurrent turns plus a cap on the backlog,
+        # so a burst fails fast instead of queueing every request on Gemini
+        self._slots = asyncio.Semaphore(int(os.getenv("ORCH_MAX_INFLIGHT", "32")))
+        self._queue_cap = int(os.getenv("ORCH_QUEUE_CAP", "128"))
+        self._admitted = 0       # turns currently running or waiting for a slot
 
-    def _get_user_text(self, request: SendTaskRequest) -> str:
+    @staticmethod
+    def _get_user_text(request: SendTaskRequest) -> str:
         """
-        Helper: extract the user's raw input text from the request object.
+        Helper: extract the user's input text (whitespace-stripped) from the
+        request object.
         """
-        return request.params.message.parts[0].text
+        return request.params.message.parts[0].text.strip()
+
+    async def _invoke_coalesced(self, user_text: str, session_id: str) -> str:
+        """
+        Run agent.invoke once per identical (text, session) pair in flight:
+        duplicate submissions that arrive while the first is still running
+        await the same result instead of triggering another LLM run.
+        """
+        key = (user_text, session_id)
+        future = self._inflight.get(key)
+        if future is None:
+            # Count the turn before anything can yield to the event loop, so
+            # the caller's _overloaded() check and this increment are atomic
+            self._admitted += 1
+            future = asyncio.ensure_future(self._invoke_admitted(user_text, session_id))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._release(key))
+        else:
+            logger.info("Coalescing duplicate request for session %s", session_id)
+        # Shield so one caller disconnecting does not cancel the shared run
+        return await asyncio.shield(future)
+
+    def _overloaded(self) -> bool:
+        """True when the backlog is full and new turns should be rejected."""
+        return self._admitted >= self._queue_cap
+
+    def _release(self, key: tuple[str, str]) -> None:
+        """Done-callback of a coalesced turn: free its backlog place."""
+        self._inflight.pop(key, None)
+        self._admitted -= 1
+
+    async def _invoke_admitted(self, user_text: str, session_id: str) -> str:
+        """Run agent.invoke once a concurrency slot is free."""
+        async with self._slots:
+            return await self.agent.invoke(user_text, session_id)
+
+    async def _reject_overloaded(self, task):
+        """Mark the task failed with an overload message."""
+        logger.warning("Orchestrator overloaded; rejecting task %s", task.id)
+        reply = Message(role="agent", parts=[TextPart(text=OVERLOADED_REPLY)])
+        return await self.update_task(task, TaskStatus(state=TaskState.FAILED), reply)
 
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
         """
@@ -343,20 +960,65 @@ class OrchestratorTaskManager(InMemoryTaskManager):
         3. Append response to history, mark completed
         4. Return a SendTaskResponse with the full Task
         """
-        logger.info(f"OrchestratorTaskManager received task {request.params.id}")
+        params = request.params
+        logger.info("OrchestratorTaskManager received task %s", params.id)
 
         # Step 1: save the initial message
-        task = await self.upsert_task(request.params)
+        task = await self.upsert_task(params)
 
-        # Step 2: run orchestration logic
+        # Step 2: run orchestration logic (duplicates of an in-flight turn are
+        # always admitted, since they add no load); a blank message gets an
+        # empty reply without taking a slot
         user_text = self._get_user_text(request)
-        response_text = await self.agent.invoke(user_text, request.params.sessionId)
+        if not user_text:
+            reply = Message(role="agent", parts=[TextPart(text="")])
+            task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), reply)
+            return SendTaskResponse(id=request.id, result=task)
+        if self._overloaded() and (user_text, params.sessionId) not in self._inflight:
+            task = await self._reject_overloaded(task)
+            return SendTaskResponse(id=request.id, result=task)
+        # No await between the check above and _invoke_coalesced admitting the turn
+        response_text = await self._invoke_coalesced(user_text, params.sessionId)
 
         # Step 3: wrap the LLM output into a Message
         reply = Message(role="agent", parts=[TextPart(text=response_text)])
-        async with self.lock:
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            task.history.append(reply)
+        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), reply)
 
         # Step 4: return structured response
         return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request: SendTaskStreamingRequest):
+        """
+        Called for `tasks/sendSubscribe`: streams Gemini's reply as it is
+        generated. Each text chunk is pushed as a WORKING status update; the
+        last event carries the full reply with state COMPLETED.
+        """
+        params = request.params
+        logger.info("OrchestratorTaskManager streaming task %s", params.id)
+        task = await self.upsert_task(params)
+
+        if self._overloaded():
+            task = await self._reject_overloaded(task)
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskStatusUpdateEvent(id=task.id, status=task.status, final=True),
+            )
+            return
+
+        # Admitted right after the check, with no await in between
+        self._admitted += 1
+        try:
+            async with self._slots:
+                async for update in self.agent.stream(self._get_user_text(request), params.sessionId):
+                    message = Message(role="agent", parts=[TextPart(text=update["content"])])
+                    if update["is_task_complete"]:
+                        status = TaskStatus(state=TaskState.COMPLETED, message=message)
+                        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), message)
+                    else:
+                        status = TaskStatus(state=TaskState.WORKING, message=message)
+                    yield SendTaskStreamingResponse(
+                        id=request.id,
+                        result=TaskStatusUpdateEvent(id=task.id, status=status, final=update["is_task_complete"]),
+                    )
+        finally:
+            self._admitted -= 1
@@ -10,6 +10,7 @@ import logging
 from .agent import IoTCarbonAgent
 from .task_manager import IoTCarbonTaskManager
 from server.server import A2AServer
+from utilities.prewarm import prewarm_enabled, prewarm_llm
 from models.agent import AgentCard, AgentCapabilities, AgentSkill
 
 # Set up logging
@@ -88,6 +89,16 @@ def main(host: str, port: int, mqtt_broker: str, mqtt_port: int):
         agent_card=agent_card,
         task_manager=task_manager
     )
+
+    # Run the MQTT listener on uvicorn's loop alongside the request handlers
+    server.app.router.on_startup.append(iot_agent.start_mqtt)
+    server.app.router.on_shutdown.append(iot_agent.stop_mqtt)
+
+    if prewarm_enabled():
+        # Warm the Gemini client on uvicorn's loop before the first request
+        async def _prewarm():
+            await prewarm_llm(iot_agent.agent)
+        server.app.router.on_startup.append(_prewarm)
     
     logger.info("🌱 IoT Carbon Sequestration Agent server started successfully!")
     logger.info(f"📡 Agent available at: http://{host}:{port}/")
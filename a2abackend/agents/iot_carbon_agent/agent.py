@@ -10,11 +10,11 @@
 import logging
 import asyncio
 import json
-import paho.mqtt.client as mqtt
+import aiomqtt
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from collections import deque
-import threading
+from array import array
 import time
 
 from dotenv import load_dotenv
@@ -33,6 +33,56 @@ from google.adk.tools.function_tool import FunctionTool
 # Create a module-level logger
 logger = logging.getLogger(__name__)
 
+# Seconds to wait before reconnecting after the MQTT connection fails or drops
+MQTT_RECONNECT_DELAY = 5.0
+
+# Most MQTT messages handled as one batch (messages already queued when the
+# first one is taken); bounds how long one batch holds the event loop
+MQTT_BATCH_MAX = 256
+
+# Seconds a carbon credit prediction is reused; matches the devices' 15-second
+# reporting cadence, so a cached prediction is at most one reading behind
+PREDICTION_CACHE_TTL = 15.0
+
+# Number of recent readings kept for trend analysis and forecasts
+RECENT_READINGS_CAP = 100
+
+# orjson is optional; fall back to the stdlib decoder when it is missing.
+# Both accept the raw payload bytes, and orjson.JSONDecodeError subclasses
+# json.JSONDecodeError, so callers handle one exception type.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# msgspec is optional; when installed, sensor_data payloads are decoded
+# straight into typed fields by a decoder compiled for this schema, instead
+# of JSON -> dict -> dict.get/float() per field. Unknown keys are ignored.
+try:
+    import msgspec
+
+    class SensorMsg(msgspec.Struct):
+        mac: str = "unknown"
+        ip: str = "unknown"
+        avg_c: float = 0.0
+        avg_h: float = 0.0
+        cr: float = 0.0
+        e: float = 0.0
+        o: Union[bool, str] = False
+        t: Optional[float] = None        # epoch ms
+        samples: int = 1
+
+    _sensor_decoder = msgspec.json.Decoder(SensorMsg)
+except ImportError:
+    _sensor_decoder = None
+
 
 class IoTCarbonAgent:
     """
@@ -48,18 +98,36 @@ class IoTCarbonAgent:
 
     def __init__(self, mqtt_broker: str = "localhost", mqtt_port: int = 1883):
         """
-        🏗️ Constructor: build the internal LLM agent, runner, and MQTT listener.
+        🏗️ Constructor: build the internal LLM agent and runner. The MQTT
+        listener is started separately with start_mqtt() once the server's
+        event loop is running.
         """
         # MQTT configuration
         self.mqtt_broker = mqtt_broker
         self.mqtt_port = mqtt_port
-        self.mqtt_client = None
+        self._mqtt_task: Optional[asyncio.Task] = None
         self.mqtt_connected = False
         
         # Real-time data storage (in-memory only, no database)
         self.device_data = {}  # device_mac -> latest data
-        self.recent_readings = deque(maxlen=100)  # Keep last 100 readings
-        self.prediction_cache = {}  # Cache for predictions
+        # Running totals of the latest credits/emissions across all devices,
+        # kept in step with device_data so tools don't re-sum it per call
+        self._total_credits = 0.0
+        self._total_emissions = 0.0
+        # Last RECENT_READINGS_CAP readings as fixed-size per-metric ring
+        # buffers (structure of arrays): a reading overwrites one float slot
+        # per column, with no allocation or eviction; _recent_slice() gives
+        # readers the values in arrival order
+        self._recent_times = array("d", [0.0]) * RECENT_READINGS_CAP  # epoch ms
+        self._recent_credits = array("d", [0.0]) * RECENT_READINGS_CAP
+        self._recent_emissions = array("d", [0.0]) * RECENT_READINGS_CAP
+        self._recent_co2 = array("d", [0.0]) * RECENT_READINGS_CAP
+        self._recent_humidity = array("d", [0.0]) * RECENT_READINGS_CAP
+        self._recent_idx = 0     # next slot to write
+        self._recent_count = 0   # filled slots, up to RECENT_READINGS_CAP
+        # (hours, device count) -> (prediction, monotonic deadline); entries
+        # expire after PREDICTION_CACHE_TTL rather than on every reading
+        self.prediction_cache: Dict[tuple, tuple] = {}
         
         # MQTT topics - match the IoT device topics from main.cpp
         self.sensor_topic = "carbon_sequestration/+/sensor_data"  # Wildcard for all devices
@@ -82,9 +150,6 @@ class IoTCarbonAgent:
             memory_service=InMemoryMemoryService(),
         )
 
-        # Start MQTT listening in background
-        self._start_mqtt_listener()
-
     def _build_agent(self) -> LlmAgent:
         """
         🔧 Build the Gemini-based LlmAgent with IoT carbon tools and instructions.
@@ -135,55 +200,85 @@ class IoTCarbonAgent:
             tools=tools,
         )
 
-    def _start_mqtt_listener(self):
+    async def start_mqtt(self):
         """
-        🚀 Start MQTT listener in background thread
+        🚀 Start the MQTT listener as a task on the running event loop, the
+        same loop that serves tool calls, so messages need no thread hand-off
         """
-        try:
-            self.mqtt_client = mqtt.Client()
-            self.mqtt_client.on_connect = self._on_mqtt_connect
-            self.mqtt_client.on_message = self._on_mqtt_message
-            self.mqtt_client.on_disconnect = self._on_mqtt_disconnect
-            
-            # Connect to MQTT broker
-            self.mqtt_client.connect(self.mqtt_broker, self.mqtt_port, 60)
-            self.mqtt_client.loop_start()
-            
+        if self._mqtt_task is None:
+            self._mqtt_task = asyncio.create_task(self._mqtt_listener())
             logger.info(f"🌱 IoT Carbon Agent started MQTT listener on {self.mqtt_broker}:{self.mqtt_port}")
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to start MQTT listener: {e}")
-
-    def _on_mqtt_connect(self, client, userdata, flags, rc):
-        """Callback for MQTT connection"""
-        if rc == 0:
-            logger.info("✅ Connected to MQTT broker")
-            self.mqtt_connected = True
-            # Subscribe to all IoT carbon sequestration topics
-            client.subscribe(self.sensor_topic)
-            client.subscribe(self.alerts_topic)
-            client.subscribe(self.heartbeat_topic)
-            client.subscribe(self.commands_topic)
-            logger.info(f"📡 Subscribed to topics: {self.sensor_topic}, {self.alerts_topic}, {self.heartbeat_topic}, {self.commands_topic}")
-        else:
-            logger.error(f"❌ MQTT connection failed with code {rc}")
-            self.mqtt_connected = False
 
-    def _on_mqtt_message(self, client, userdata, msg):
-        """Callback for MQTT messages"""
+    async def stop_mqtt(self):
+        """
+        🛑 Cancel the MQTT listener task and close its connection
+        """
+        if self._mqtt_task is None:
+            return
+        self._mqtt_task.cancel()
+        try:
+            await self._mqtt_task
+        except asyncio.CancelledError:
+            pass
+        self._mqtt_task = None
+        self.mqtt_connected = False
+
+    async def _mqtt_listener(self):
+        """
+        Connect, subscribe to all IoT carbon sequestration topics and dispatch
+        messages; reconnect after MQTT_RECONNECT_DELAY seconds whenever the
+        connection fails or drops
+        """
+        topics = [
+            (topic, 0)
+            for topic in (self.sensor_topic, self.alerts_topic, self.heartbeat_topic, self.commands_topic)
+        ]
+        while True:
+            try:
+                async with aiomqtt.Client(self.mqtt_broker, self.mqtt_port, keepalive=60) as client:
+                    logger.info("✅ Connected to MQTT broker")
+                    self.mqtt_connected = True
+                    await client.subscribe(topics)
+                    logger.info(f"📡 Subscribed to topics: {self.sensor_topic}, {self.alerts_topic}, {self.heartbeat_topic}, {self.commands_topic}")
+
+                    async for message in client.messages:
+                        # Take whatever else is already queued and handle it in one pass
+                        batch = [message]
+                        while len(client.messages) and len(batch) < MQTT_BATCH_MAX:
+                            batch.append(await anext(client.messages))
+                        self._on_mqtt_batch(batch)
+            except aiomqtt.MqttError as e:
+                if self.mqtt_connected:
+                    logger.warning(f"⚠️ MQTT disconnected: {e}")
+                else:
+                    logger.error(f"❌ MQTT connection failed: {e}")
+                self.mqtt_connected = False
+            await asyncio.sleep(MQTT_RECONNECT_DELAY)
+
+    def _on_mqtt_batch(self, messages: List[aiomqtt.Message]):
+        """Handle a batch of MQTT messages in one pass"""
+        for message in messages:
+            self._on_mqtt_message(message.topic.value, message.payload)
+
+    def _on_mqtt_message(self, topic: str, payload: bytes):
+        """Handle one MQTT message"""
         try:
-            topic = msg.topic
-            payload = json.loads(msg.payload.decode('utf-8'))
-            
             # Extract company name from topic (format: carbon_sequestration/{company}/{message_type})
             topic_parts = topic.split('/')
             company_name = topic_parts[1] if len(topic_parts) > 1 else "Unknown"
             
+            logger.debug("📨 Received MQTT message on %s from company: %s", topic, company_name)
+            
+            # Sensor readings take the typed decoder when msgspec is installed
+            if "sensor_data" in topic and _sensor_decoder is not None:
+                self._process_sensor_msg(_sensor_decoder.decode(payload), company_name)
+                return
+            
+            payload = _loads(payload)
+            
             # Add company information to payload
             payload['company'] = company_name
             
-            logger.info(f"📨 Received MQTT message on {topic} from company: {company_name}")
-            
             if "sensor_data" in topic:
                 self._process_sensor_data(payload)
             elif "alerts" in topic:
@@ -194,75 +289,110 @@ class IoTCarbonAgent:
                 self._process_command_data(payload)
                 
         except json.JSONDecodeError as e:
-            logger.error(f"❌ Failed to decode MQTT message: {e}")
+            logger.error("❌ Failed to decode MQTT message: %s", e)
         except Exception as e:
-            logger.error(f"❌ Error processing MQTT message: {e}")
-
-    def _on_mqtt_disconnect(self, client, userdata, rc):
-        """Callback for MQTT disconnection"""
-        logger.warning("⚠️ MQTT disconnected")
-        self.mqtt_connected = False
+            logger.error("❌ Error processing MQTT message: %s", e)
 
     def _process_sensor_data(self, data: Dict[str, Any]):
         """
         Process IoT sensor data and update in-memory storage
         """
         try:
-            # Extract device information
-            device_mac = data.get('mac', 'unknown')
-            device_ip = data.get('ip', 'unknown')
-            company_name = data.get('company', 'Unknown')
-            
-            # Extract sensor readings
-            avg_co2 = float(data.get('avg_c', 0))
-            avg_humidity = float(data.get('avg_h', 0))
-            carbon_credits = float(data.get('cr', 0))
-            emissions = float(data.get('e', 0))
             offset = data.get('o', False)
             if isinstance(offset, str):
                 offset = offset.lower() == 'true'
-            timestamp = data.get('t', int(time.time() * 1000))
-            samples = int(data.get('samples', 1))
-            
-            # Convert timestamp to datetime
-            sensor_time = datetime.fromtimestamp(timestamp / 1000)
-            
-            # Store device data (in-memory only)
-            self.device_data[device_mac] = {
-                "device_ip": device_ip,
-                "device_mac": device_mac,
-                "company_name": company_name,
-                "avg_co2": avg_co2,
-                "avg_humidity": avg_humidity,
-                "carbon_credits": carbon_credits,
-                "emissions": emissions,
-                "offset": offset,
-                "sensor_time": sensor_time,
-                "samples": samples,
-                "last_update": datetime.now()
-            }
-            
-            # Store in recent readings queue
-            self.recent_readings.append({
-                "device_mac": device_mac,
-                "device_ip": device_ip,
-                "company_name": company_name,
-                "avg_co2": avg_co2,
-                "avg_humidity": avg_humidity,
-                "carbon_credits": carbon_credits,
-                "emissions": emissions,
-                "offset": offset,
-                "sensor_time": sensor_time,
-                "samples": samples
-            })
-            
-            # Clear prediction cache when new data arrives
-            self.prediction_cache.clear()
-            
-            logger.info(f"🌱 Updated data for device {device_mac}: {carbon_credits} credits")
-            
+            self._store_reading(
+                device_mac=data.get('mac', 'unknown'),
+                device_ip=data.get('ip', 'unknown'),
+                company_name=data.get('company', 'Unknown'),
+                avg_co2=float(data.get('avg_c', 0)),
+                avg_humidity=float(data.get('avg_h', 0)),
+                carbon_credits=float(data.get('cr', 0)),
+                emissions=float(data.get('e', 0)),
+                offset=offset,
+                timestamp=float(data.get('t', time.time() * 1000)),
+                samples=int(data.get('samples', 1)),
+            )
         except Exception as e:
-            logger.error(f"❌ Error processing sensor data: {e}")
+            logger.error("❌ Error processing sensor data: %s", e)
+
+    def _process_sensor_msg(self, msg: "SensorMsg", company_name: str):
+        """
+        Process an IoT sensor reading decoded by msgspec (fields already typed)
+        """
+        try:
+            offset = msg.o
+            if isinstance(offset, str):
+                offset = offset.lower() == 'true'
+            self._store_reading(
+                device_mac=msg.mac,
+                device_ip=msg.ip,
+                company_name=company_name,
+                avg_co2=msg.avg_c,
+                avg_humidity=msg.avg_h,
+                carbon_credits=msg.cr,
+                emissions=msg.e,
+                offset=offset,
+                timestamp=msg.t if msg.t is not None else time.time() * 1000,
+                samples=msg.samples,
+            )
+        except Exception as e:
+            logger.error("❌ Error processing sensor data: %s", e)
+
+    def _store_reading(
+        self,
+        device_mac: str,
+        device_ip: str,
+        company_name: str,
+        avg_co2: float,
+        avg_humidity: float,
+        carbon_credits: float,
+        emissions: float,
+        offset: bool,
+        timestamp: float,
+        samples: int,
+    ):
+        """
+        Update the in-memory storage with one sensor reading
+        """
+        # Move the running totals from this device's previous reading to the new one
+        prev = self.device_data.get(device_mac)
+        if prev is not None:
+            self._total_credits += carbon_credits - prev["carbon_credits"]
+            self._total_emissions += emissions - prev["emissions"]
+        else:
+            self._total_credits += carbon_credits
+            self._total_emissions += emissions
+        
+        # Store device data (in-memory only). Times are kept as epoch
+        # numbers; tools build datetimes only for the fields they output
+        self.device_data[device_mac] = {
+            "device_ip": device_ip,
+            "device_mac": device_mac,
+            "company_name": company_name,
+            "avg_co2": avg_co2,
+            "avg_humidity": avg_humidity,
+            "carbon_credits": carbon_credits,
+            "emissions": emissions,
+            "offset": offset,
+            "sensor_ts": timestamp,          # epoch ms, from the device
+            "samples": samples,
+            "last_update_ts": time.time(),   # epoch seconds, on receipt (for output)
+            "last_update_mono": time.monotonic()  # on receipt, for ages
+        }
+        
+        # Store in the recent readings ring buffers
+        i = self._recent_idx
+        self._recent_times[i] = timestamp
+        self._recent_credits[i] = carbon_credits
+        self._recent_emissions[i] = emissions
+        self._recent_co2[i] = avg_co2
+        self._recent_humidity[i] = avg_humidity
+        self._recent_idx = (i + 1) % RECENT_READINGS_CAP
+        if self._recent_count < RECENT_READINGS_CAP:
+            self._recent_count += 1
+        
+        logger.debug("🌱 Updated data for device %s: %s credits", device_mac, carbon_credits)
 
     def _process_alert_data(self, data: Dict[str, Any]):
         """
@@ -275,8 +405,8 @@ class IoTCarbonAgent:
             co2_level = data.get('co2', 0)
             credits = data.get('credits', 0)
             
-            logger.warning(f"🚨 ALERT from {device_mac}: {alert_type} - {message}")
-            logger.warning(f"   CO2: {co2_level}, Credits: {credits}")
+            logger.warning("🚨 ALERT from %s: %s - %s", device_mac, alert_type, message)
+            logger.warning("   CO2: %s, Credits: %s", co2_level, credits)
             
             # Store alert for analysis
             if not hasattr(self, 'recent_alerts'):
@@ -292,7 +422,7 @@ class IoTCarbonAgent:
             })
             
         except Exception as e:
-            logger.error(f"❌ Error processing alert data: {e}")
+            logger.error("❌ Error processing alert data: %s", e)
 
     def _process_heartbeat_data(self, data: Dict[str, Any]):
         """
@@ -305,7 +435,7 @@ class IoTCarbonAgent:
             uptime = data.get('uptime', 0)
             rssi = data.get('rssi', 0)
             
-            logger.info(f"💓 Heartbeat from {device_mac}: {status}, uptime: {uptime}ms, RSSI: {rssi}")
+            logger.debug("💓 Heartbeat from %s: %s, uptime: %sms, RSSI: %s", device_mac, status, uptime, rssi)
             
             # Update device status
             if device_mac in self.device_data:
@@ -315,7 +445,7 @@ class IoTCarbonAgent:
                 self.device_data[device_mac]["rssi"] = rssi
             
         except Exception as e:
-            logger.error(f"❌ Error processing heartbeat data: {e}")
+            logger.error("❌ Error processing heartbeat data: %s", e)
 
     def _process_command_data(self, data: Dict[str, Any]):
         """
@@ -325,13 +455,13 @@ class IoTCarbonAgent:
             device_mac = data.get('mac', 'unknown')
             command = data.get('command', 'unknown')
             
-            logger.info(f"📨 Command from {device_mac}: {command}")
+            logger.debug("📨 Command from %s: %s", device_mac, command)
             
             # Process commands if needed
             # This could be used to send commands back to devices
             
         except Exception as e:
-            logger.error(f"❌ Error processing command data: {e}")
+            logger.error("❌ Error processing command data: %s", e)
 
     async def get_live_sensor_data(self) -> Dict[str, Any]:
         """
@@ -345,9 +475,9 @@ class IoTCarbonAgent:
                     "mqtt_connected": self.mqtt_connected
                 }
             
-            # Calculate totals
-            total_credits = sum(device["carbon_credits"] for device in self.device_data.values())
-            total_emissions = sum(device["emissions"] for device in self.device_data.values())
+            # Totals are maintained incrementally as readings arrive
+            total_credits = self._total_credits
+            total_emissions = self._total_emissions
             active_devices = len(self.device_data)
             
             # Get device details
@@ -361,8 +491,8 @@ class IoTCarbonAgent:
                     "offset": data["offset"],
                     "avg_co2": data["avg_co2"],
                     "avg_humidity": data["avg_humidity"],
-                    "last_update": data["last_update"].isoformat(),
-                    "sensor_time": data["sensor_time"].isoformat()
+                    "last_update": datetime.fromtimestamp(data["last_update_ts"]).isoformat(),
+                    "sensor_time": datetime.fromtimestamp(data["sensor_ts"] / 1000).isoformat()
                 })
             
             return {
@@ -394,9 +524,16 @@ class IoTCarbonAgent:
                     "mqtt_connected": self.mqtt_connected
                 }
             
-            # Calculate current generation rate
-            current_credits = sum(device["carbon_credits"] for device in self.device_data.values())
-            current_emissions = sum(device["emissions"] for device in self.device_data.values())
+            # Reuse a recent prediction for the same horizon and device count
+            now_mono = time.monotonic()
+            cache_key = (hours, len(self.device_data))
+            cached = self.prediction_cache.get(cache_key)
+            if cached is not None and cached[1] > now_mono:
+                return cached[0]
+            
+            # Current generation rate (running totals over all devices)
+            current_credits = self._total_credits
+            current_emissions = self._total_emissions
             
             # Estimate hourly generation rate
             # Assuming data comes every 15 seconds, calculate rate per hour
@@ -410,21 +547,19 @@ class IoTCarbonAgent:
             net_sequestration = predicted_credits - predicted_emissions
             
             # Calculate confidence based on data freshness
-            now = datetime.now()
-            max_age = max((now - device["last_update"]).total_seconds() for device in self.device_data.values())
+            max_age = now_mono - min(device["last_update_mono"] for device in self.device_data.values())
             confidence = max(0, 1 - (max_age / 3600))  # Confidence decreases with data age
             
-            # Generate hourly breakdown
-            hourly_breakdown = []
-            for hour in range(1, hours + 1):
-                hourly_breakdown.append({
-                    "hour": hour,
-                    "predicted_credits": round(hourly_credits, 2),
-                    "predicted_emissions": round(hourly_emissions, 2),
-                    "net_sequestration": round(hourly_credits - hourly_emissions, 2)
-                })
+            # Generate hourly breakdown; the rate is the same every hour, so
+            # round it once and stamp the hour onto a shared template
+            hourly_template = {
+                "predicted_credits": round(hourly_credits, 2),
+                "predicted_emissions": round(hourly_emissions, 2),
+                "net_sequestration": round(hourly_credits - hourly_emissions, 2)
+            }
+            hourly_breakdown = [{"hour": hour, **hourly_template} for hour in range(1, hours + 1)]
             
-            return {
+            prediction = {
                 "prediction_period": f"{hours} hours",
                 "current_data": {
                     "active_devices": len(self.device_data),
@@ -450,6 +585,13 @@ class IoTCarbonAgent:
                 ]
             }
             
+            # Cache it, dropping any expired entries
+            self.prediction_cache = {
+                key: entry for key, entry in self.prediction_cache.items() if entry[1] > now_mono
+            }
+            self.prediction_cache[cache_key] = (prediction, now_mono + PREDICTION_CACHE_TTL)
+            return prediction
+            
         except Exception as e:
             logger.error(f"Error predicting carbon credits: {e}")
             return {"error": f"Failed to predict carbon credits: {str(e)}"}
@@ -468,22 +610,28 @@ class IoTCarbonAgent:
             
             devices = []
             now = datetime.now()
+            now_mono = time.monotonic()
+            # Status counts, tallied in the same pass that builds the list
+            active_count = stale_count = inactive_count = 0
             
             for device_mac, data in self.device_data.items():
                 # Calculate device status
-                age_seconds = (now - data["last_update"]).total_seconds()
+                age_seconds = now_mono - data["last_update_mono"]
                 if age_seconds < 60:
                     status = "active"
+                    active_count += 1
                 elif age_seconds < 300:  # 5 minutes
                     status = "stale"
+                    stale_count += 1
                 else:
                     status = "inactive"
+                    inactive_count += 1
                 
                 devices.append({
                     "device_mac": device_mac,
                     "device_ip": data["device_ip"],
                     "status": status,
-                    "last_update": data["last_update"].isoformat(),
+                    "last_update": datetime.fromtimestamp(data["last_update_ts"]).isoformat(),
                     "age_seconds": round(age_seconds, 1),
                     "carbon_credits": data["carbon_credits"],
                     "emissions": data["emissions"],
@@ -493,19 +641,18 @@ class IoTCarbonAgent:
                 })
             
             # Calculate overall status
-            active_count = sum(1 for device in devices if device["status"] == "active")
             total_count = len(devices)
             
             return {
                 "overall_status": {
                     "total_devices": total_count,
                     "active_devices": active_count,
-                    "stale_devices": sum(1 for device in devices if device["status"] == "stale"),
-                    "inactive_devices": sum(1 for device in devices if device["status"] == "inactive"),
+                    "stale_devices": stale_count,
+                    "inactive_devices": inactive_count,
                     "mqtt_connected": self.mqtt_connected
                 },
                 "devices": devices,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
             
         except Exception as e:
@@ -517,26 +664,20 @@ class IoTCarbonAgent:
         📈 Analyze carbon sequestration trends from recent data
         """
         try:
-            if len(self.recent_readings) < 2:
+            if self._recent_count < 2:
                 return {
                     "error": "Insufficient data for trend analysis",
-                    "readings_count": len(self.recent_readings)
+                    "readings_count": self._recent_count
                 }
             
-            # Convert deque to list for analysis
-            readings = list(self.recent_readings)
-            
-            # Calculate trends
-            credits_trend = []
-            emissions_trend = []
-            co2_trend = []
-            humidity_trend = []
-            
-            for reading in readings:
-                credits_trend.append(reading["carbon_credits"])
-                emissions_trend.append(reading["emissions"])
-                co2_trend.append(reading["avg_co2"])
-                humidity_trend.append(reading["avg_humidity"])
+            # Snapshot each metric column in arrival order (a C-level copy)
+            times = self._recent_slice(self._recent_times)
+            first_time = times[0]
+            last_time = times[-1]
+            credits_trend = self._recent_slice(self._recent_credits)
+            emissions_trend = self._recent_slice(self._recent_emissions)
+            co2_trend = self._recent_slice(self._recent_co2)
+            humidity_trend = self._recent_slice(self._recent_humidity)
             
             # Calculate averages and trends
             avg_credits = sum(credits_trend) / len(credits_trend)
@@ -563,8 +704,8 @@ class IoTCarbonAgent:
             
             return {
                 "analysis_period": {
-                    "readings_analyzed": len(readings),
-                    "time_span": f"{(readings[-1]['sensor_time'] - readings[0]['sensor_time']).total_seconds():.0f} seconds"
+                    "readings_analyzed": len(credits_trend),
+                    "time_span": f"{(last_time - first_time) / 1000:.0f} seconds"
                 },
                 "trends": {
                     "credits_trend": trend_direction,
@@ -595,18 +736,14 @@ class IoTCarbonAgent:
         💼 Get advice for companies preparing for carbon credit needs
         """
         try:
-            # Get current data
-            live_data = await self.get_live_sensor_data()
-            if "error" in live_data:
-                return live_data
-            
-            # Get predictions
+            # Get predictions (reused from the prediction cache when recent)
             prediction = await self.predict_carbon_credits(24)  # 24-hour prediction
             if "error" in prediction:
                 return prediction
             
-            # Calculate preparation advice
-            current_credits = live_data["summary"]["total_credits"]
+            # Calculate preparation advice; current credits come from the
+            # running total, without building get_live_sensor_data's device list
+            current_credits = self._total_credits
             predicted_credits = prediction["predictions"]["total_credits"]
             net_sequestration = prediction["predictions"]["net_sequestration"]
             
@@ -706,7 +843,11 @@ class IoTCarbonAgent:
             return ""
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
 
     async def get_mqtt_forecast(self, hours: int = 24) -> Dict[str, Any]:
         """
@@ -721,19 +862,18 @@ class IoTCarbonAgent:
                 }
             
             # Get recent data for trend analysis
-            recent_data = list(self.recent_readings)[-20:]  # Last 20 readings
+            # Last 20 readings of each metric column
+            co2_values = self._recent_slice(self._recent_co2, 20)
+            credit_values = self._recent_slice(self._recent_credits, 20)
+            humidity_values = self._recent_slice(self._recent_humidity, 20)
+            newest_time = self._recent_times[(self._recent_idx - 1) % RECENT_READINGS_CAP]
             
-            if not recent_data:
+            if not co2_values:
                 return {
                     "error": "No recent MQTT data for forecast",
                     "mqtt_connected": self.mqtt_connected
                 }
             
-            # Calculate current trends
-            co2_values = [r["avg_co2"] for r in recent_data]
-            credit_values = [r["carbon_credits"] for r in recent_data]
-            humidity_values = [r["avg_humidity"] for r in recent_data]
-            
             # Calculate averages and trends
             avg_co2 = sum(co2_values) / len(co2_values)
             avg_credits = sum(credit_values) / len(credit_values)
@@ -787,7 +927,7 @@ class IoTCarbonAgent:
                 "forecast_source": "MQTT IoT Devices",
                 "forecast_period_hours": hours,
                 "generated_at": datetime.now().isoformat(),
-                "data_points_analyzed": len(recent_data),
+                "data_points_analyzed": len(co2_values),
                 "mqtt_connected": self.mqtt_connected,
                 "current_metrics": {
                     "avg_co2": round(avg_co2, 1),
@@ -800,7 +940,7 @@ class IoTCarbonAgent:
                 "forecast_points": forecast_points,
                 "recommendations": recommendations,
                 "active_devices": len(self.device_data),
-                "data_freshness": f"{(datetime.now() - recent_data[-1]['sensor_time']).total_seconds():.0f} seconds ago"
+                "data_freshness": f"{time.time() - newest_time / 1000:.0f} seconds ago"
             }
             
         except Exception as e:
@@ -866,6 +1006,7 @@ class IoTCarbonAgent:
             # Extract unique companies from device data
             companies = {}
             now = datetime.now()
+            now_mono = time.monotonic()
             
             for device_mac, data in self.device_data.items():
                 company_name = data["company_name"]
@@ -883,7 +1024,7 @@ class IoTCarbonAgent:
                     }
                 
                 # Calculate device status
-                age_seconds = (now - data["last_update"]).total_seconds()
+                age_seconds = now_mono - data["last_update_mono"]
                 device_status = "active" if age_seconds < 300 else "inactive"
                 
                 # Add device info
@@ -895,7 +1036,7 @@ class IoTCarbonAgent:
                     "emissions": data["emissions"],
                     "avg_co2": data["avg_co2"],
                     "avg_humidity": data["avg_humidity"],
-                    "last_update": data["last_update"].isoformat(),
+                    "last_update": datetime.fromtimestamp(data["last_update_ts"]).isoformat(),
                     "age_seconds": round(age_seconds, 1)
                 }
                 
@@ -909,13 +1050,13 @@ class IoTCarbonAgent:
                     companies[company_name]["inactive_devices"] += 1
                 
                 # Update last activity
-                if companies[company_name]["last_activity"] is None or data["last_update"] > companies[company_name]["last_activity"]:
-                    companies[company_name]["last_activity"] = data["last_update"]
+                if companies[company_name]["last_activity"] is None or data["last_update_ts"] > companies[company_name]["last_activity"]:
+                    companies[company_name]["last_activity"] = data["last_update_ts"]
             
             # Calculate net sequestration for each company
             for company_name in companies:
                 companies[company_name]["net_sequestration"] = companies[company_name]["total_credits"] - companies[company_name]["total_emissions"]
-                companies[company_name]["last_activity"] = companies[company_name]["last_activity"].isoformat()
+                companies[company_name]["last_activity"] = datetime.fromtimestamp(companies[company_name]["last_activity"]).isoformat()
             
             # Convert to list and sort by total credits
             company_list = list(companies.values())
@@ -940,13 +1081,21 @@ class IoTCarbonAgent:
                     "overall_offset": net_sequestration >= 0
                 },
                 "companies": company_list,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
             
         except Exception as e:
             logger.error(f"Error getting live generating companies: {e}")
             return {"error": f"Failed to get live generating companies: {str(e)}"}
 
+    def _recent_slice(self, column: array, n: int = RECENT_READINGS_CAP) -> array:
+        """Oldest-to-newest copy of the last n values of a recent-readings ring buffer"""
+        count = min(n, self._recent_count)
+        start = (self._recent_idx - count) % RECENT_READINGS_CAP
+        if start + count <= RECENT_READINGS_CAP:
+            return column[start:start + count]
+        return column[start:] + column[:start + count - RECENT_READINGS_CAP]
+
     def _calculate_trend(self, values: List[float]) -> float:
         """Calculate linear trend from a list of values"""
         if len(values) < 2:
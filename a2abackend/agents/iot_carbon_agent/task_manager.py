@@ -7,7 +7,6 @@
 # =============================================================================
 
 import logging
-from typing import Optional
 from server.task_manager import InMemoryTaskManager
 from models.request import SendTaskRequest, SendTaskResponse
 from models.task import Message, TextPart, TaskStatus, TaskState
@@ -79,12 +78,8 @@ class IoTCarbonTaskManager(InMemoryTaskManager):
         )
 
         # Step 5: Update the task status to COMPLETED and append our reply
-        # Use the lock to avoid race conditions with other coroutines.
-        async with self.lock:
-            # Mark the task as done
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            # Add the agent's reply to the task's history
-            task.history.append(reply_message)
+        # update_task locks just this task, so other tasks are not blocked.
+        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), reply_message)
 
         # Step 6: Return a SendTaskResponse, containing the JSON-RPC id
         # (mirroring the request.id) and the updated Task model.
@@ -6,9 +6,10 @@
 # to help users send payments across Hedera, Ethereum, and Polygon networks.
 # =============================================================================
 
+import asyncio
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -23,25 +24,32 @@ from google.adk.runners import Runner
 from google.genai import types
 from google.adk.tools.function_tool import FunctionTool
 
-# Web3 imports for blockchain interactions
-import requests
-import json
 import os
-import uuid
-import urllib.request
 from decimal import Decimal
+import difflib
+
+# Carbon marketplace DB helpers (imported once; a missing driver fails at startup)
+from utilities.carbon_marketplace.db import fetch_all_async
+from utilities.carbon_marketplace.purchase import purchase_credits
 
 # Create a module-level logger
 logger = logging.getLogger(__name__)
 
+# Buyer account recorded on carbon credit purchases (.env is loaded above)
+_DEFAULT_BUYER = os.getenv("OPERATOR_ID") or os.getenv("HEDERA_ACCOUNT_ID") or "0.0.123456"
+
+
+# Address formats, compiled once at import
+_HEDERA_ACCOUNT_RE = re.compile(r'^\d+\.\d+\.\d+$')       # 0.0.123456
+_EVM_ADDRESS_RE = re.compile(r'^0x[a-fA-F0-9]{40}$')        # 0x + 40 hex chars
+
+# On-chain memo for marketplace purchases. The static prefix stays identical
+# across purchases so memos are easy to filter on mirror nodes.
+_PURCHASE_MEMO = "Carbon credits purchase company={company_id} credits={amount}".format
+
 # Hedera SDK imports - using Hiero SDK Python (no Java dependencies)
 HEDERA_SDK_AVAILABLE = False
 
-# Web3 imports for Ethereum and Polygon
-from web3 import Web3
-from eth_account import Account
-from eth_account.signers.local import LocalAccount
-
 def _check_hedera_sdk():
     """Check if we can use Hiero SDK Python (no Java dependencies)"""
     global HEDERA_SDK_AVAILABLE
@@ -410,129 +418,139 @@ class PaymentAgent:
             tools=tools,
         )
 
+    @staticmethod
+    async def _lookup_company(company_name: str = "") -> Optional[Dict[str, Any]]:
+        """
+        🔎 Resolve the company to buy from via the async DB pool.
+        Tries exact, then contains, then fuzzy name match; with no name,
+        picks the cheapest offer. Returns the row or None.
+        """
+        base_query = (
+            "SELECT c.company_id, c.company_name, c.wallet_address, cc.offer_price "
+            "FROM company c INNER JOIN company_credit cc ON c.company_id = cc.company_id "
+        )
+
+        rows = []
+        if company_name:
+            # Normalize provided name
+            name = company_name.strip()
+            # Try exact ILIKE match
+            q1 = base_query + "WHERE c.company_name ILIKE $1 ORDER BY cc.offer_price ASC LIMIT 1"
+            rows = await fetch_all_async(q1, [name])
+            # Try contains match if not found
+            if not rows:
+                rows = await fetch_all_async(q1, [f"%{name}%"])
+            # Try fuzzy match if still not found
+            if not rows:
+                all_rows = await fetch_all_async(base_query + "ORDER BY cc.offer_price ASC")
+                candidates = [(r, difflib.SequenceMatcher(a=name.lower(), b=str(r.get("company_name","" )).lower()).ratio()) for r in all_rows]
+                candidates.sort(key=lambda x: x[1], reverse=True)
+                if candidates and candidates[0][1] >= 0.6:  # threshold
+                    rows = [candidates[0][0]]
+        else:
+            # No name given: pick cheapest
+            q4 = base_query + "ORDER BY cc.offer_price ASC LIMIT 1"
+            rows = await fetch_all_async(q4)
+
+        return rows[0] if rows else None
+
     async def buy_carbon_credits(
         self,
         amount: float,
         company_name: str = ""
     ) -> Dict[str, Any]:
-            """
-            Purchase carbon credits by:
-            1) Getting company details from CarbonCreditAgent via Orchestrator
-            2) Processing HBAR payment to company
-            3) Recording purchase in database
-            """
+        """
+        Purchase carbon credits by:
+        1) Getting company details from the marketplace database
+        2) Processing HBAR payment to company
+        3) Recording purchase in database
+        """
+        try:
+            # Fail fast if payments are impossible, before touching the database
+            if not HEDERA_SDK_AVAILABLE:
+                return {"status": "failed", "message": "Hiero SDK Python not available. PaymentAgent cannot function."}
+            if not getattr(self, "hedera_client", None):
+                return {"status": "failed", "message": "Hedera client not configured. Check your .env configuration."}
+
+            buyer = _DEFAULT_BUYER
+            credits = Decimal(str(amount))
+
+            # 1) Get company details from the marketplace database
             try:
-                # 1) Get company details directly from database
-                try:
-                    from utilities.carbon_marketplace.db import fetch_all
-                    
-                    base_query = (
-                        "SELECT c.company_id, c.company_name, c.wallet_address, cc.offer_price "
-                        "FROM company c INNER JOIN company_credit cc ON c.company_id = cc.company_id "
-                    )
-                    
-                    rows = []
-                    if company_name:
-                        # Normalize provided name
-                        name = company_name.strip()
-                        # Try exact ILIKE match
-                        q1 = base_query + "WHERE c.company_name ILIKE %s ORDER BY cc.offer_price ASC LIMIT 1"
-                        rows = fetch_all(q1, [name])
-                        # Try contains match if not found
-                        if not rows:
-                            q2 = base_query + "WHERE c.company_name ILIKE %s ORDER BY cc.offer_price ASC LIMIT 1"
-                            rows = fetch_all(q2, [f"%{name}%"]) 
-                        # Try fuzzy match if still not found
-                        if not rows:
-                            import difflib
-                            all_rows = fetch_all(base_query + "ORDER BY cc.offer_price ASC", [])
-                            candidates = [(r, difflib.SequenceMatcher(a=name.lower(), b=str(r.get("company_name","" )).lower()).ratio()) for r in all_rows]
-                            candidates.sort(key=lambda x: x[1], reverse=True)
-                            if candidates and candidates[0][1] >= 0.6:  # threshold
-                                rows = [candidates[0][0]]
-                    else:
-                        # No name given: pick cheapest
-                        q4 = base_query + "ORDER BY cc.offer_price ASC LIMIT 1"
-                        rows = fetch_all(q4, [])
-                    
-                    if not rows:
-                        return {"status": "failed", "message": "No company found"}
-                    
-                    row = rows[0]
-                    comp_id = int(row["company_id"])
-                    comp_wallet = str(row["wallet_address"])
-                    price_per_credit = float(row["offer_price"])
-                    company_name_resolved = str(row["company_name"])
-                    
-                except Exception as e:
-                    logger.error(f"Failed to get company details: {e}")
-                    return {"status": "failed", "message": "Could not get company details"}
+                row = await self._lookup_company(company_name)
+            except Exception as e:
+                logger.error(f"Failed to get company details: {e}")
+                return {"status": "failed", "message": "Could not get company details"}
 
-                # 2) Process HBAR payment
-                total_hbar = float(amount) * float(price_per_credit)
-                memo = f"Carbon credits purchase company={comp_id} credits={amount}"
-                
-                # Use existing Hedera transfer logic
-                payment_result = await self._execute_hedera_transfer(
-                    destination_account=comp_wallet,
-                    amount=total_hbar,
-                    memo=memo
+            if not row:
+                return {"status": "failed", "message": "No company found"}
+
+            comp_id = int(row["company_id"])
+            comp_wallet = str(row["wallet_address"])
+            price_per_credit = float(row["offer_price"])
+
+            # 2) Process HBAR payment
+            total_hbar = float(amount) * float(price_per_credit)
+            memo = _PURCHASE_MEMO(company_id=comp_id, amount=amount)
+
+            # Use existing Hedera transfer logic
+            payment_result = await self._execute_hedera_transfer(
+                destination_account=comp_wallet,
+                amount=total_hbar,
+                memo=memo
+            )
+
+            if not payment_result.get("success", False):
+                # Use the specific error message from the payment result
+                error_message = payment_result.get("error", "Payment failed")
+                return {"status": "failed", "message": error_message}
+
+            # 3) Record purchase in database
+            tx_id = payment_result.get("transaction_id", memo)
+            try:
+                # Run the blocking DB write off the event loop so concurrent
+                # purchases overlap instead of serializing
+                success, message = await asyncio.to_thread(
+                    purchase_credits,
+                    company_id=comp_id,
+                    user_account=buyer,
+                    amount=credits,
+                    payment_tx_id=tx_id,
                 )
-                
-                if not payment_result.get("success", False):
-                    # Use the specific error message from the payment result
-                    error_message = payment_result.get("error", "Payment failed")
-                    return {"status": "failed", "message": error_message}
 
-                # 3) Record purchase in database
-                try:
-                    from utilities.carbon_marketplace.purchase import purchase_credits
-                    buyer = (
-                        os.getenv("OPERATOR_ID")
-                        or os.getenv("HEDERA_ACCOUNT_ID")
-                        or "0.0.123456"
-                    )
-                    success, message = purchase_credits(
-                        company_id=comp_id,
-                        user_account=buyer,
-                        amount=Decimal(str(amount)),
-                        payment_tx_id=payment_result.get("transaction_id", memo),
-                    )
-                    
-                    if success:
-                        return {
-                            "status": "success",
-                            "message": f"Successfully purchased {amount} carbon credits for {total_hbar} HBAR",
-                            "company_id": comp_id,
-                            "wallet": comp_wallet,
-                            "price_per_credit": price_per_credit,
-                            "amount": amount,
-                            "total_hbar": total_hbar,
-                            "transaction_id": payment_result.get("transaction_id", memo),
-                        }
-                    else:
-                        return {"status": "failed", "message": f"Database recording failed: {message}"}
-                        
-                except Exception as e:
-                    logger.error(f"Database recording failed: {e}")
-                    return {"status": "failed", "message": f"Database recording failed: {str(e)}"}
+                if success:
+                    return {
+                        "status": "success",
+                        "message": f"Successfully purchased {amount} carbon credits for {total_hbar} HBAR",
+                        "company_id": comp_id,
+                        "wallet": comp_wallet,
+                        "price_per_credit": price_per_credit,
+                        "amount": amount,
+                        "total_hbar": total_hbar,
+                        "transaction_id": tx_id,
+                    }
+                else:
+                    return {"status": "failed", "message": f"Database recording failed: {message}"}
 
             except Exception as e:
-                logger.error(f"Error in buy_carbon_credits: {e}")
-                return {"status": "failed", "message": str(e)}
+                logger.error(f"Database recording failed: {e}")
+                return {"status": "failed", "message": f"Database recording failed: {str(e)}"}
+
+        except Exception as e:
+            logger.error(f"Error in buy_carbon_credits: {e}")
+            return {"status": "failed", "message": str(e)}
 
     def _validate_address_format(self, address: str, network: str) -> bool:
         """
         🔍 Validate payment address format for specific network.
         """
-        if network.lower() == "hedera":
+        network = network.lower()
+        if network == "hedera":
             # Hedera account format: 0.0.123456
-            pattern = r'^\d+\.\d+\.\d+$'
-            return bool(re.match(pattern, address))
-        elif network.lower() in ["ethereum", "polygon"]:
+            return bool(_HEDERA_ACCOUNT_RE.match(address))
+        elif network in ("ethereum", "polygon"):
             # Ethereum/Polygon address format: 0x followed by 40 hex characters
-            pattern = r'^0x[a-fA-F0-9]{40}$'
-            return bool(re.match(pattern, address))
+            return bool(_EVM_ADDRESS_RE.match(address))
         return False
 
     async def _execute_hedera_transfer(
@@ -866,7 +884,11 @@ class PaymentAgent:
             return ""
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
 
     async def stream(self, query: str, session_id: str):
         """
@@ -3,8 +3,6 @@ Prebooking Agent for Carbon Credit Prebooking and Prepayment
 Handles prebooking with $300 threshold for automatic vs manual approval
 """
 
-import asyncio
-import json
 import logging
 import httpx
 import os
@@ -888,4 +886,8 @@ class PrebookingAgent:
         if not last_event or not last_event.content or not last_event.content.parts:
             return "I apologize, but I couldn't process your request. Please try again."
         
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
\ No newline at end of file
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
\ No newline at end of file
@@ -66,9 +66,7 @@ class PrebookingTaskManager(InMemoryTaskManager):
             )
             
             # Step 5: Update the task state and add the message to history
-            async with self.lock:
-                task.status = TaskStatus(state=TaskState.COMPLETED)
-                task.history.append(agent_message)
+            task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), agent_message)
             
             logger.info(f"✅ Prebooking task {request.params.id} completed successfully")
             
@@ -91,8 +89,6 @@ class PrebookingTaskManager(InMemoryTaskManager):
             )
             
             # Update task with error
-            async with self.lock:
-                task.status = TaskStatus(state=TaskState.COMPLETED)
-                task.history.append(agent_message)
+            task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), agent_message)
             
             return SendTaskResponse(id=request.id, result=task)
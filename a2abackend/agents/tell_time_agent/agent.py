@@ -132,7 +132,11 @@ class TellTimeAgent:
             return ""
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
 
 
     async def stream(self, query: str, session_id: str):
@@ -25,7 +25,7 @@ from agents.tell_time_agent.agent import TellTimeAgent
 
 # 📦 Import data models used to structure and return tasks
 from models.request import SendTaskRequest, SendTaskResponse
-from models.task import Message, Task, TextPart, TaskStatus, TaskState
+from models.task import Message, TextPart, TaskStatus, TaskState
 
 
 # -----------------------------------------------------------------------------
@@ -103,9 +103,8 @@ class AgentTaskManager(InMemoryTaskManager):
         )
 
         # Step 5: Update the task state and add the message to history
-        async with self.lock:                   # Lock access to avoid concurrent writes
-            task.status = TaskStatus(state=TaskState.COMPLETED)  # Mark task as done
-            task.history.append(agent_message)  # Append the agent's message to the task history
+        # Mark task as done and append the agent's message (locks only this task)
+        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), agent_message)
 
         # Step 6: Return a structured response back to the A2A client
         return SendTaskResponse(id=request.id, result=task)
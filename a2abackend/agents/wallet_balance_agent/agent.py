@@ -8,7 +8,7 @@
 
 import logging
 import re
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional
 from utilities.network_rpc import (
     get_sepolia_rpc,
     get_polygon_mumbai_rpc,
@@ -347,7 +347,11 @@ class WalletBalanceAgent:
             return ""
 
         # 📤 Extract and join all text responses into one string
-        return "\n".join([p.text for p in last_event.content.parts if p.text])
+        parts = last_event.content.parts
+        if len(parts) == 1:
+            # Common case: a single text part, nothing to join
+            return parts[0].text or ""
+        return "\n".join(p.text for p in parts if p.text)
 
     async def stream(self, query: str, session_id: str):
         """
@@ -50,7 +50,7 @@ class WalletBalanceTaskManager(InMemoryTaskManager):
             agent (WalletBalanceAgent): The core logic handler that knows how to
                                       process wallet balance requests across networks.
         """
-        # Call the parent constructor to set up self.tasks and self.lock
+        # Call the parent constructor to set up self.tasks and the per-task locks
         super().__init__()
         # Store a reference to our WalletBalanceAgent for later use
         self.agent = agent
@@ -113,12 +113,8 @@ class WalletBalanceTaskManager(InMemoryTaskManager):
         )
 
         # Step 5: Update the task status to COMPLETED and append our reply
-        # Use the lock to avoid race conditions with other coroutines.
-        async with self.lock:
-            # Mark the task as done
-            task.status = TaskStatus(state=TaskState.COMPLETED)
-            # Add the agent's reply to the task's history
-            task.history.append(reply_message)
+        # update_task locks just this task, so other tasks are not blocked.
+        task = await self.update_task(task, TaskStatus(state=TaskState.COMPLETED), reply_message)
 
         # Step 6: Return a SendTaskResponse, containing the JSON-RPC id
         # (mirroring the request.id) and the updated Task model.
@@ -15,8 +15,8 @@
 # Imports
 # -----------------------------------------------------------------------------
 
-import json
-from uuid import uuid4                                 # Used to encode/decode JSON data
+import json                                 # Used to encode/decode JSON data
+import os                                   # os.urandom for request IDs
 import httpx                                # Async HTTP client for making web requests
 from httpx_sse import connect_sse           # SSE client extension for httpx (not used currently)
 from typing import Any                      # Type hints for flexible input/output
@@ -31,6 +31,18 @@ from models.json_rpc import JSONRPCRequest
 from models.task import Task, TaskSendParams
 from models.agent import AgentCard
 
+# orjson is optional; it makes the request debug dump much cheaper
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _pretty_json(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
 
 # -----------------------------------------------------------------------------
 # Custom Error Classes
@@ -50,10 +62,14 @@ class A2AClientJSONError(Exception):
 # -----------------------------------------------------------------------------
 
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    def __init__(self, agent_card: AgentCard = None, url: str = None, http_client: httpx.AsyncClient = None):
         """
         Initializes the client using either an agent card or a direct URL.
         One of the two must be provided.
+
+        Pass a shared `http_client` to reuse pooled keep-alive connections
+        across requests (and across clients); without one, each request
+        opens and closes its own connection.
         """
         if agent_card:
             self.url = agent_card.url
@@ -61,6 +77,7 @@ class A2AClient:
             self.url = url
         else:
             raise ValueError("Must provide either agent_card or url")
+        self.http_client = http_client
 
 
     # -------------------------------------------------------------------------
@@ -69,12 +86,12 @@ class A2AClient:
     async def send_task(self, payload: dict[str, Any]) -> Task:
 
         request = SendTaskRequest(
-            id=uuid4().hex,
+            id=os.urandom(16).hex(),
             params=TaskSendParams(**payload)  # ✅ Proper model wrapping
         )
 
         print("\n📤 Sending JSON-RPC request:")
-        print(json.dumps(request.model_dump(), indent=2))
+        print(_pretty_json(request.model_dump(mode="json")))
 
         response = await self._send_request(request)
         return Task(**response["result"])  # ✅ Extract just the 'result' field
@@ -95,18 +112,24 @@ class A2AClient:
     # _send_request: Internal helper to send a JSON-RPC request
     # -------------------------------------------------------------------------
     async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.url,
-                    json=request.model_dump(),  # Convert Pydantic model to JSON
-                    timeout=30
-                )
-                response.raise_for_status()     # Raise error if status code is 4xx/5xx
-                return response.json()          # Return parsed response as a dict
-
-            except httpx.HTTPStatusError as e:
-                raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+        # Reuse the shared pooled client when one was injected; its own
+        # timeouts (e.g. a short connect timeout) then apply unchanged
+        if self.http_client is not None:
+            return await self._post(self.http_client, request)
+        async with httpx.AsyncClient(timeout=30) as client:
+            return await self._post(client, request)
+
+    async def _post(self, client: httpx.AsyncClient, request: JSONRPCRequest) -> dict[str, Any]:
+        try:
+            response = await client.post(
+                self.url,
+                json=request.model_dump()   # Convert Pydantic model to JSON
+            )
+            response.raise_for_status()     # Raise error if status code is 4xx/5xx
+            return response.json()          # Return parsed response as a dict
+
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
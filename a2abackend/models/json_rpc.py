@@ -21,7 +21,7 @@
 # -----------------------------------------------------------------------------
 
 from typing import Any, Literal               # For flexible types and fixed value literals
-from uuid import uuid4                       # To generate unique request IDs
+import os                                   # os.urandom to generate unique request IDs
 from pydantic import BaseModel, Field        # For creating robust, validated data models
 
 
@@ -35,8 +35,9 @@ class JSONRPCMessage(BaseModel):
     jsonrpc: Literal["2.0"] = "2.0"
 
     # The message ID is used to match requests with responses.
-    # If not provided, we generate a unique ID using uuid4.
-    id: int | str | None = Field(default_factory=lambda: uuid4().hex)
+    # If not provided, we generate a unique 128-bit hex ID (same format as uuid4().hex,
+    # without building a UUID object).
+    id: int | str | None = Field(default_factory=lambda: os.urandom(16).hex())
 
 
 # -----------------------------------------------------------------------------
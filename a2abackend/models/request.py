@@ -13,9 +13,11 @@
 #
 # Included Models:
 # - SendTaskRequest
+# - SendTaskStreamingRequest
 # - GetTaskRequest
 # - A2ARequest (discriminated union)
 # - SendTaskResponse
+# - SendTaskStreamingResponse
 # - GetTaskResponse
 #
 # Note: CancelTaskRequest will be added in a future version if cancellation support is implemented.
@@ -33,7 +35,7 @@ from pydantic.type_adapter import TypeAdapter      # For runtime discriminated u
 from models.json_rpc import JSONRPCRequest, JSONRPCResponse
 
 # Task-related parameter and return models
-from models.task import Task, TaskSendParams
+from models.task import Task, TaskSendParams, TaskStatusUpdateEvent
 from models.task import TaskQueryParams
 
 
@@ -46,6 +48,15 @@ class SendTaskRequest(JSONRPCRequest):
     params: TaskSendParams                          # Task creation parameters
 
 
+# -----------------------------------------------------------------------------
+# SendTaskStreamingRequest: Send a task and receive updates as Server-Sent Events
+# -----------------------------------------------------------------------------
+
+class SendTaskStreamingRequest(JSONRPCRequest):
+    method: Literal["tasks/sendSubscribe"] = "tasks/sendSubscribe"  # Exact method string required
+    params: TaskSendParams                                          # Same parameters as tasks/send
+
+
 # -----------------------------------------------------------------------------
 # GetTaskRequest: Used to retrieve a task's status or history
 # -----------------------------------------------------------------------------
@@ -64,6 +75,7 @@ A2ARequest = TypeAdapter(
     Annotated[
         Union[
             SendTaskRequest,
+            SendTaskStreamingRequest,
             GetTaskRequest,
             # CancelTaskRequest can be added here in future if implemented
         ],
@@ -80,6 +92,14 @@ class SendTaskResponse(JSONRPCResponse):
     result: Task | None = None                      # The task returned by the agent
 
 
+# -----------------------------------------------------------------------------
+# SendTaskStreamingResponse: One SSE event of a "tasks/sendSubscribe" stream
+# -----------------------------------------------------------------------------
+
+class SendTaskStreamingResponse(JSONRPCResponse):
+    result: TaskStatusUpdateEvent | None = None     # A status update (text chunk or final reply)
+
+
 # -----------------------------------------------------------------------------
 # GetTaskResponse: Response model for a "tasks/get" request
 # -----------------------------------------------------------------------------
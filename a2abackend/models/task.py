@@ -8,6 +8,7 @@
 # - What a task looks like (`Task`)
 # - The state of the task (`TaskStatus`, `TaskState`)
 # - The messages exchanged during a task (`Message`, `TextPart`)
+# - Streamed status updates (`TaskStatusUpdateEvent`)
 # - Parameters used when sending, querying, or canceling tasks
 # =============================================================================
 
@@ -16,7 +17,7 @@
 # -----------------------------------------------------------------------------
 
 from enum import Enum                          # Used to create fixed-value constants (e.g. task states)
-from uuid import uuid4                         # For generating unique identifiers
+import os                                      # os.urandom for generating unique identifiers
 from pydantic import BaseModel, Field          # Pydantic for structured data validation
 from typing import Any, Literal, List          # Type hints for flexibility and structure
 from datetime import datetime                  # To store timestamps
@@ -51,6 +52,7 @@ class Message(BaseModel):
 
 class TaskStatus(BaseModel):
     state: str  # A string like "submitted", "working", etc. (defined more precisely in TaskState)
+    message: Message | None = None  # Optional agent message for this status (streamed text chunks)
     
     # Automatically captures the time when the status is recorded
     timestamp: datetime = Field(default_factory=datetime.now)
@@ -66,6 +68,16 @@ class Task(BaseModel):
     history: List[Message]     # Conversation history for the task (what the user said, how the agent replied)
 
 
+# -----------------------------------------------------------------------------
+# TaskStatusUpdateEvent: One update pushed to a streaming (sendSubscribe) client
+# -----------------------------------------------------------------------------
+
+class TaskStatusUpdateEvent(BaseModel):
+    id: str                    # The task this update belongs to
+    status: TaskStatus         # New status; status.message carries the text chunk or final reply
+    final: bool = False        # True on the last event of the stream
+
+
 # -----------------------------------------------------------------------------
 # Parameter Models for API Requests
 # -----------------------------------------------------------------------------
@@ -87,7 +99,7 @@ class TaskSendParams(BaseModel):
     id: str                                # Task ID (usually generated client-side)
     
     # Session ID used to group related tasks (autogenerated if not provided)
-    sessionId: str = Field(default_factory=lambda: uuid4().hex)
+    sessionId: str = Field(default_factory=lambda: os.urandom(16).hex())
 
     message: Message                       # The message that initiates the task
     historyLength: int | None = None       # Optional history length to return
@@ -5,8 +5,9 @@
 # This file defines a very simple A2A (Agent-to-Agent) server.
 # It supports:
 # - Receiving task requests via POST ("/")
+# - Streaming task updates as Server-Sent Events (JSON-RPC "tasks/sendSubscribe")
 # - Letting clients discover the agent's details via GET ("/.well-known/agent.json")
-# NOTE: It does not support streaming or push notifications in this version.
+# NOTE: It does not support push notifications in this version.
 # =============================================================================
 
 
@@ -16,17 +17,19 @@
 
 # 🌐 Starlette is a lightweight web framework for building ASGI applications
 from starlette.applications import Starlette            # To create our web app
-from starlette.responses import JSONResponse            # To send responses as JSON
+from starlette.responses import JSONResponse, Response  # To send responses as JSON / raw bytes
+from starlette.responses import StreamingResponse       # To send Server-Sent Events
 from starlette.requests import Request                  # Represents incoming HTTP requests
 
 # 📦 Importing our custom models and logic
 from models.agent import AgentCard                      # Describes the agent's identity and skills
 from models.request import A2ARequest, SendTaskRequest  # Request models for tasks
+from models.request import SendTaskStreamingRequest     # Streaming (SSE) variant of tasks/send
 from models.json_rpc import JSONRPCResponse, InternalError  # JSON-RPC utilities for structured messaging
 from server import task_manager              # Our actual task handling logic (Gemini agent)
 
 # 🛠️ General utilities
-import json                                              # Used for printing the request payloads (for debugging)
+import json                                              # Fallback encoder when orjson is not installed
 import logging                                           # Used to log errors and info messages
 logger = logging.getLogger(__name__)                     # Setup logger for this file
 
@@ -35,6 +38,15 @@ from datetime import datetime
 
 # 📦 Encoder to help convert complex data like datetime into JSON
 from fastapi.encoders import jsonable_encoder
+from decimal import Decimal
+
+# ⚡ orjson is optional: when installed, responses are encoded in C
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
 
 
 # -----------------------------------------------------------------------------
@@ -42,14 +54,32 @@ from fastapi.encoders import jsonable_encoder
 # -----------------------------------------------------------------------------
 def json_serializer(obj):
     """
-    This function can convert Python datetime objects to ISO strings.
+    This function can convert Python datetime objects to ISO strings
+    and Decimal values (e.g. NUMERIC columns) to floats.
     If you try to serialize a type it doesn't know, it will raise an error.
     """
     if isinstance(obj, datetime):
         return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def dumps_json(obj, indent: bool = False) -> bytes:
+    """
+    Encode a JSON-compatible object to UTF-8 bytes, using orjson when
+    available and the standard library otherwise.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=json_serializer, option=option)
+    return json.dumps(
+        obj, default=json_serializer, indent=2 if indent else None, ensure_ascii=False
+    ).encode("utf-8")
+
+
 # -----------------------------------------------------------------------------
 # 🚀 A2AServer Class: The Core Server Logic
 # -----------------------------------------------------------------------------
@@ -69,6 +99,10 @@ class A2AServer:
         self.agent_card = agent_card
         self.task_manager = task_manager
 
+        # 🗂️ The agent card never changes after startup, so its JSON body is
+        # serialized once (on first request) and reused for every discovery poll
+        self._agent_card_body: bytes | None = None
+
         # 🌐 Starlette app initialization
         self.app = Starlette()
 
@@ -91,19 +125,29 @@ class A2AServer:
 
         # Dynamically import uvicorn so it’s only loaded when needed
         import uvicorn
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        import importlib.util
+
+        # ⚡ Prefer the libuv event loop and C HTTP parser when installed
+        loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+        http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+        logger.info(f"Starting uvicorn with loop={loop}, http={http}")
+        uvicorn.run(self.app, host=self.host, port=self.port, loop=loop, http=http)
 
     # -----------------------------------------------------------------------------
     # 🔎 _get_agent_card(): Return the agent’s metadata (GET request)
     # -----------------------------------------------------------------------------
-    def _get_agent_card(self, request: Request) -> JSONResponse:
+    def _get_agent_card(self, request: Request) -> Response:
         """
         Endpoint for agent discovery (GET /.well-known/agent.json)
 
         Returns:
-            JSONResponse: Agent metadata as a dictionary
+            Response: Agent metadata as pre-serialized JSON bytes
         """
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+        if self._agent_card_body is None:
+            self._agent_card_body = dumps_json(
+                self.agent_card.model_dump(mode="json", exclude_none=True)
+            )
+        return Response(self._agent_card_body, media_type="application/json")
 
     # -----------------------------------------------------------------------------
     # 📥 _handle_request(): Handle incoming POST requests for tasks
@@ -120,7 +164,7 @@ class A2AServer:
         try:
             # Step 1: Parse incoming JSON body
             body = await request.json()
-            print("\n🔍 Incoming JSON:", json.dumps(body, indent=2))  # Log input for visibility
+            print("\n🔍 Incoming JSON:", dumps_json(body, indent=True).decode())  # Log input for visibility
 
             # Step 2: Parse and validate request using discriminated union
             json_rpc = A2ARequest.validate_python(body)
@@ -128,6 +172,11 @@ class A2AServer:
             # Step 3: If it’s a send-task request, call the task manager to handle it
             if isinstance(json_rpc, SendTaskRequest):
                 result = await self.task_manager.on_send_task(json_rpc)
+            elif isinstance(json_rpc, SendTaskStreamingRequest):
+                # Each status update is sent as its own SSE event as soon as it exists
+                return StreamingResponse(
+                    self._stream_events(json_rpc), media_type="text/event-stream"
+                )
             else:
                 raise ValueError(f"Unsupported A2A method: {type(json_rpc)}")
 
@@ -142,6 +191,23 @@ class A2AServer:
                 status_code=400
             )
 
+    # -----------------------------------------------------------------------------
+    # 📡 _stream_events(): Encode streamed task updates as SSE frames
+    # -----------------------------------------------------------------------------
+    async def _stream_events(self, json_rpc: SendTaskStreamingRequest):
+        """
+        Yields one `data: <json>` frame per SendTaskStreamingResponse from
+        the task manager. Errors after the stream has started are reported
+        as a final JSON-RPC error frame, since the HTTP status is already sent.
+        """
+        try:
+            async for response in self.task_manager.on_send_task_subscribe(json_rpc):
+                yield b"data: " + dumps_json(response.model_dump(exclude_none=True)) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Exception while streaming: {e}")
+            error = JSONRPCResponse(id=json_rpc.id, error=InternalError(message=str(e)))
+            yield b"data: " + dumps_json(error.model_dump(exclude_none=True)) + b"\n\n"
+
     # -----------------------------------------------------------------------------
     # 🧾 _create_response(): Converts result object to JSONResponse
     # -----------------------------------------------------------------------------
@@ -156,6 +222,12 @@ class A2AServer:
             JSONResponse: Starlette-compatible HTTP response with JSON body
         """
         if isinstance(result, JSONRPCResponse):
+            if ORJSON_AVAILABLE:
+                # orjson encodes datetime, UUID and enums natively; Decimal via json_serializer
+                return Response(
+                    dumps_json(result.model_dump(exclude_none=True)),
+                    media_type="application/json",
+                )
             # jsonable_encoder automatically handles datetime and UUID
             return JSONResponse(content=jsonable_encoder(result.model_dump(exclude_none=True)))
         else:
@@ -7,11 +7,11 @@
 # ✅ Includes:
 # - A base abstract class `TaskManager` that outlines required methods
 # - A simple `InMemoryTaskManager` that keeps tasks temporarily in memory
+# - A `RedisTaskManager` that shares tasks across server replicas via Redis
 #
 # ❌ Does not include:
 # - Cancel task functionality
 # - Push notifications or real-time updates
-# - Persistent storage (like a database)
 # =============================================================================
 
 
@@ -21,6 +21,7 @@
 
 from abc import ABC, abstractmethod        # Lets us define abstract base classes (like an interface)
 from typing import Dict                    # Dict is a dictionary type for storing key-value pairs
+from collections import defaultdict        # Creates a task's lock on first use
 import asyncio                             # Used here for locks to safely handle concurrency (async operations)
 
 
@@ -30,12 +31,14 @@ import asyncio                             # Used here for locks to safely handl
 
 from models.request import (
     SendTaskRequest, SendTaskResponse,    # For sending tasks to the agent
+    SendTaskStreamingRequest, SendTaskStreamingResponse,  # For streamed (SSE) task updates
     GetTaskRequest, GetTaskResponse       # For querying task info from the agent
 )
 
 from models.task import (
     Task, TaskSendParams, TaskQueryParams,  # Task and input models
-    TaskStatus, TaskState, Message          # Task metadata and history objects
+    TaskStatus, TaskState, Message,         # Task metadata and history objects
+    TaskStatusUpdateEvent                   # One streamed status update
 )
 
 
@@ -64,11 +67,39 @@ class TaskManager(ABC):
         """📤 This method will return task details by task ID."""
         pass
 
+    async def on_send_task_subscribe(self, request: SendTaskStreamingRequest):
+        """
+        📡 Handles tasks/sendSubscribe by yielding SendTaskStreamingResponse
+        events. This default runs on_send_task and pushes its result as one
+        final event; agents that can stream partial text override it.
+        """
+        response = await self.on_send_task(
+            SendTaskRequest(id=request.id, params=request.params)
+        )
+        task = response.result
+        if task is None:
+            yield SendTaskStreamingResponse(id=request.id, error=response.error)
+            return
+
+        reply = task.history[-1] if task.history and task.history[-1].role == "agent" else None
+        yield SendTaskStreamingResponse(
+            id=request.id,
+            result=TaskStatusUpdateEvent(
+                id=task.id,
+                status=TaskStatus(state=task.status.state, message=reply),
+                final=True,
+            ),
+        )
+
 
 # -----------------------------------------------------------------------------
 # 🧠 InMemoryTaskManager
 # -----------------------------------------------------------------------------
 
+# States after which a task's per-task lock is released. A tuple, not a set:
+# TaskStatus.state may hold a plain str or a TaskState, which hash differently
+_FINAL_STATES = (TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED)
+
 class InMemoryTaskManager(TaskManager):
     """
     🧠 A simple, temporary task manager that stores everything in memory (RAM).
@@ -83,7 +114,9 @@ class InMemoryTaskManager(TaskManager):
 
     def __init__(self):
         self.tasks: Dict[str, Task] = {}   # 🗃️ Dictionary where key = task ID, value = Task object
-        self.lock = asyncio.Lock()         # 🔐 Async lock to ensure two requests don't modify data at the same time
+        # 🔐 One async lock per task ID, so updates to the same task never interleave
+        # while unrelated tasks don't wait on each other
+        self._task_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     # -------------------------------------------------------------------------
     # 💾 upsert_task: Create or update a task in memory
@@ -98,7 +131,7 @@ class InMemoryTaskManager(TaskManager):
         Returns:
             Task – the newly created or updated task
         """
-        async with self.lock:
+        async with self._task_locks[params.id]:
             task = self.tasks.get(params.id)  # Try to find an existing task with this ID
 
             if task is None:
@@ -115,6 +148,31 @@ class InMemoryTaskManager(TaskManager):
 
             return task
 
+    # -------------------------------------------------------------------------
+    # ✅ update_task: Record a new status (and optional reply) for a task
+    # -------------------------------------------------------------------------
+    async def update_task(self, task: Task, status: TaskStatus, reply: Message | None = None) -> Task:
+        """
+        Set the task's status and append the agent's reply to its history.
+
+        Args:
+            task: The Task returned by upsert_task
+            status: The new TaskStatus
+            reply: Optional agent Message to append
+
+        Returns:
+            Task – the updated task
+        """
+        async with self._task_locks[task.id]:
+            task.status = status
+            if reply is not None:
+                task.history.append(reply)
+
+        # Finished tasks rarely change again; drop their lock to bound memory
+        if status.state in _FINAL_STATES:
+            self._task_locks.pop(task.id, None)
+        return task
+
     # -------------------------------------------------------------------------
     # 🚫 on_send_task: Must be implemented by any subclass
     # -------------------------------------------------------------------------
@@ -141,19 +199,101 @@ class InMemoryTaskManager(TaskManager):
         Returns:
             GetTaskResponse – contains the task if found, or an error message
         """
-        async with self.lock:
-            query: TaskQueryParams = request.params
-            task = self.tasks.get(query.id)
-
-            if not task:
-                # If task not found, return a structured error
-                return GetTaskResponse(id=request.id, error={"message": "Task not found"})
-
-            # Optional: Trim the history to only show the last N messages
-            task_copy = task.model_copy()  # Make a copy so we don't affect the original
-            if query.historyLength is not None:
-                task_copy.history = task_copy.history[-query.historyLength:]  # Get last N messages
-            else:
-                task_copy.history = task_copy.history
+        # Read-only and nothing here awaits, so no lock is needed
+        query: TaskQueryParams = request.params
+        task = self.tasks.get(query.id)
+
+        if not task:
+            # If task not found, return a structured error
+            return GetTaskResponse(id=request.id, error={"message": "Task not found"})
 
-            return GetTaskResponse(id=request.id, result=task_copy)
+        # Optional: Trim the history to only show the last N messages
+        task_copy = task.model_copy()  # Make a copy so we don't affect the original
+        if query.historyLength is not None:
+            task_copy.history = task_copy.history[-query.historyLength:]  # Get last N messages
+        else:
+            task_copy.history = task_copy.history
+
+        return GetTaskResponse(id=request.id, result=task_copy)
+
+
+# -----------------------------------------------------------------------------
+# 🗄️ RedisTaskManager
+# -----------------------------------------------------------------------------
+
+class RedisTaskManager(InMemoryTaskManager):
+    """
+    🗄️ Task manager that keeps tasks in Redis when a URL is configured,
+    so several server replicas can share them behind a load balancer.
+
+    Layout (keys expire after `ttl` seconds):
+    - task:{id}:status  -> TaskStatus JSON (written with SET NX on creation)
+    - task:{id}:history -> list of Message JSON (appended with RPUSH)
+
+    Each operation is one MULTI/EXEC pipeline, so no process-wide lock is
+    needed. Without a Redis URL it behaves exactly like InMemoryTaskManager.
+    """
+
+    def __init__(self, redis_url: str | None = None, ttl: int = 24 * 3600):
+        super().__init__()
+        self.redis = None
+        self.ttl = ttl
+        if redis_url:
+            import redis.asyncio as redis   # Only needed when Redis is configured
+            self.redis = redis.from_url(redis_url)
+
+    async def upsert_task(self, params: TaskSendParams) -> Task:
+        if self.redis is None:
+            return await super().upsert_task(params)
+
+        status_key, history_key = f"task:{params.id}:status", f"task:{params.id}:history"
+        submitted = TaskStatus(state=TaskState.SUBMITTED)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(status_key, submitted.model_dump_json(), nx=True, ex=self.ttl)
+            pipe.rpush(history_key, params.message.model_dump_json())
+            pipe.expire(history_key, self.ttl)
+            pipe.get(status_key)
+            pipe.lrange(history_key, 0, -1)
+            *_, status_json, history = await pipe.execute()
+
+        return Task(
+            id=params.id,
+            status=TaskStatus.model_validate_json(status_json),
+            history=[Message.model_validate_json(m) for m in history],
+        )
+
+    async def update_task(self, task: Task, status: TaskStatus, reply: Message | None = None) -> Task:
+        if self.redis is None:
+            return await super().update_task(task, status, reply)
+
+        task.status = status
+        status_key, history_key = f"task:{task.id}:status", f"task:{task.id}:history"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(status_key, status.model_dump_json(), ex=self.ttl)
+            if reply is not None:
+                task.history.append(reply)
+                pipe.rpush(history_key, reply.model_dump_json())
+                pipe.expire(history_key, self.ttl)
+            await pipe.execute()
+        return task
+
+    async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
+        if self.redis is None:
+            return await super().on_get_task(request)
+
+        query: TaskQueryParams = request.params
+        start = -query.historyLength if query.historyLength else 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(f"task:{query.id}:status")
+            pipe.lrange(f"task:{query.id}:history", start, -1)
+            status_json, history = await pipe.execute()
+
+        if status_json is None:
+            return GetTaskResponse(id=request.id, error={"message": "Task not found"})
+
+        task = Task(
+            id=query.id,
+            status=TaskStatus.model_validate_json(status_json),
+            history=[Message.model_validate_json(m) for m in history],
+        )
+        return GetTaskResponse(id=request.id, result=task)
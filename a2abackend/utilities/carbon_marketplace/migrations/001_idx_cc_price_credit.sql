@@ -0,0 +1,8 @@
+-- Migration 001: index for carbon credit offer searches
+-- Apply to existing databases (fresh installs get it from schema.sql).
+-- CONCURRENTLY cannot run inside a transaction block, so run this file
+-- on its own, e.g.: psql "$CARBON_MARKETPLACE_DATABASE_URL" -f 001_idx_cc_price_credit.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cc_price_credit
+    ON company_credit (offer_price ASC NULLS LAST, current_credit)
+    WHERE current_credit > 0;
@@ -0,0 +1,17 @@
+-- Migration 002: indexes for company-name purchase lookups
+-- Apply to existing databases (fresh installs get these from schema.sql).
+-- CONCURRENTLY cannot run inside a transaction block, so run this file
+-- on its own, e.g.: psql "$CARBON_MARKETPLACE_DATABASE_URL" -f 002_company_name_trgm.sql
+-- Creating the extension needs a role allowed to do so (usually the DB owner).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_company_name_trgm
+    ON company USING gin (company_name gin_trgm_ops);
+
+-- Replaces idx_company_credit_company: same leading column, plus offer_price
+-- so "WHERE company_id = ... ORDER BY offer_price LIMIT 1" is an index scan
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_company_credit_company_price
+    ON company_credit (company_id, offer_price);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_company_credit_company;
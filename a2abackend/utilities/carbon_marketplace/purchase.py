@@ -1,5 +1,7 @@
+import asyncio
 from decimal import Decimal
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+from psycopg2.extras import execute_values
 from .db import get_db_connection
 
 
@@ -8,41 +10,130 @@ def purchase_credits(company_id: int, user_account: str, amount: Decimal, paymen
     Deduct 'amount' credits from company's current_credit, add to sold_credit,
     and record a purchase row. Returns (success, message).
     """
+    return purchase_credits_batch(
+        [{"company_id": company_id, "amount": amount}],
+        user_account=user_account,
+        payment_tx_id=payment_tx_id,
+    )
+
+
+def purchase_credits_batch(items: List[Dict], user_account: str, payment_tx_id: Optional[str] = None) -> Tuple[bool, str]:
+    """
+    Record purchases from several companies in one transaction.
+
+    'items' is a list of {"company_id": int, "amount": Decimal}. A company may
+    have several offer rows in company_credit; each company is served from its
+    cheapest offer row that covers the company's total amount in this batch.
+    All balance updates go out as one multi-row UPDATE ... FROM (VALUES ...)
+    keyed by credit_id, and one purchase row per item as one INSERT, so N
+    purchases cost one commit instead of N. Either every item is recorded or
+    none is. Returns (success, message).
+    """
+    purchases: List[Tuple[int, Decimal]] = []
+    # Total per company, so each company's offer row is checked and updated once
+    amounts: Dict[int, Decimal] = {}
+    for item in items:
+        company_id = int(item["company_id"])
+        amount = item["amount"]
+        if not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        purchases.append((company_id, amount))
+        amounts[company_id] = amounts.get(company_id, Decimal("0")) + amount
+    if not purchases:
+        return False, "No purchases to record"
+
     conn = get_db_connection()
     try:
-        with conn.cursor() as cur:
-            # Lock row for update
-            cur.execute("SELECT current_credit, offer_price FROM company_credit WHERE company_id=%s FOR UPDATE", (company_id,))
-            row = cur.fetchone()
-            if not row:
-                return False, "Company credit not found"
-            current_credit, offer_price = row
-            if current_credit < amount:
-                return False, "Insufficient company credit"
+        # get_db_connection() is autocommit; this batch must be atomic
+        conn.autocommit = False
+        with conn, conn.cursor() as cur:
+            # Lock every offer row of the affected companies in one round trip,
+            # cheapest first (FOR UPDATE cannot be combined with DISTINCT ON)
+            cur.execute(
+                """
+                SELECT credit_id, company_id, current_credit, offer_price
+                FROM company_credit
+                WHERE company_id = ANY(%s)
+                ORDER BY company_id, offer_price ASC NULLS LAST, credit_id
+                FOR UPDATE
+                """,
+                (list(amounts),),
+            )
+            offers: Dict[int, List[Tuple[int, Decimal, Optional[Decimal]]]] = {}
+            for credit_id, company_id, current_credit, offer_price in cur.fetchall():
+                offers.setdefault(company_id, []).append((credit_id, current_credit, offer_price))
+
+            # Pick exactly one offer row per company: the cheapest that covers it
+            chosen: Dict[int, Tuple[int, Decimal]] = {}
+            for company_id, amount in amounts.items():
+                if company_id not in offers:
+                    conn.rollback()
+                    return False, f"Company credit not found for company {company_id}"
+                row = next((o for o in offers[company_id] if o[1] >= amount), None)
+                if row is None:
+                    conn.rollback()
+                    return False, f"Insufficient company credit for company {company_id}"
+                credit_id, _, offer_price = row
+                chosen[company_id] = (credit_id, offer_price or Decimal("0.00"))
 
             # Update balances
-            cur.execute(
+            execute_values(
+                cur,
                 """
-                UPDATE company_credit
-                SET current_credit = current_credit - %s,
-                    sold_credit = sold_credit + %s
-                WHERE company_id = %s
+                UPDATE company_credit AS cc
+                SET current_credit = cc.current_credit - v.amt,
+                    sold_credit = cc.sold_credit + v.amt
+                FROM (VALUES %s) AS v(credit_id, amt)
+                WHERE cc.credit_id = v.credit_id
                 """,
-                (amount, amount, company_id),
+                [(chosen[company_id][0], amount) for company_id, amount in amounts.items()],
+                template="(%s::integer, %s::numeric)",
+                page_size=len(amounts),
             )
 
-            total_price = (offer_price or Decimal("0.00")) * amount
-            # Record purchase
-            cur.execute(
+            # Record purchases, one row per item, at the chosen offer's price
+            execute_values(
+                cur,
                 """
                 INSERT INTO credit_purchase (company_id, user_account, amount, price_per_credit, total_price, payment_tx_id)
-                VALUES (%s, %s, %s, %s, %s, %s)
+                VALUES %s
                 """,
-                (company_id, user_account, amount, offer_price or Decimal("0.00"), total_price, payment_tx_id),
+                [
+                    (company_id, user_account, amount, chosen[company_id][1], chosen[company_id][1] * amount, payment_tx_id)
+                    for company_id, amount in purchases
+                ],
+                page_size=len(purchases),
             )
 
-        return True, "Purchase recorded"
+        return True, "Purchase recorded" if len(purchases) == 1 else f"{len(purchases)} purchases recorded"
     finally:
         conn.close()
 
 
+async def purchase_credits_many(items: List[Dict], user_account: str, max_concurrency: int = 8) -> List[Tuple[bool, str]]:
+    """
+    Record purchases that cannot share one transaction, e.g. because each
+    company was paid by its own HBAR transfer and carries its own
+    payment_tx_id. Items are {"company_id", "amount", "payment_tx_id"}.
+
+    Each purchase runs in a worker thread and they overlap, so N round trips
+    cost roughly the slowest one rather than the sum. The semaphore caps how
+    many DB connections are open at once. Returns one (success, message)
+    per item, in order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _purchase_one(item: Dict) -> Tuple[bool, str]:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    purchase_credits,
+                    int(item["company_id"]),
+                    user_account,
+                    item["amount"] if isinstance(item["amount"], Decimal) else Decimal(str(item["amount"])),
+                    item.get("payment_tx_id"),
+                )
+            except Exception as e:
+                return False, str(e)
+
+    return list(await asyncio.gather(*(_purchase_one(item) for item in items)))
@@ -1,6 +1,9 @@
 -- Schema for Carbon Credit Marketplace
 -- Uses PostgreSQL
 
+-- Trigram matching for company-name ILIKE lookups
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 CREATE TABLE IF NOT EXISTS company (
     company_id SERIAL PRIMARY KEY,
     company_name VARCHAR(255) NOT NULL,
@@ -32,7 +35,14 @@ CREATE TABLE IF NOT EXISTS credit_purchase (
 
 -- Helpful indexes
 CREATE INDEX IF NOT EXISTS idx_company_wallet ON company(wallet_address);
-CREATE INDEX IF NOT EXISTS idx_company_credit_company ON company_credit(company_id);
+-- Serves company lookups ordered by price (company_id prefix also covers the FK)
+CREATE INDEX IF NOT EXISTS idx_company_credit_company_price ON company_credit(company_id, offer_price);
+-- Serves company_name ILIKE '%name%' lookups, which a btree cannot
+CREATE INDEX IF NOT EXISTS idx_company_name_trgm ON company USING gin (company_name gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_purchase_company ON credit_purchase(company_id);
+-- Serves offer searches: filter on current_credit, ordered by offer_price
+CREATE INDEX IF NOT EXISTS idx_cc_price_credit
+    ON company_credit (offer_price ASC NULLS LAST, current_credit)
+    WHERE current_credit > 0;
 
 
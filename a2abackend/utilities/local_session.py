@@ -0,0 +1,101 @@
+# utilities/local_session.py
+# =============================================================================
+# 🎯 Purpose:
+# A process-local ADK session service without per-call deep copies.
+#
+# ADK's InMemorySessionService deep-copies the whole session (every event of
+# the conversation) on each get_session/create_session, and Runner.run_async
+# calls get_session on every turn, so a turn costs O(history) before the LLM
+# is even called. This service hands out the stored Session object itself;
+# append_event updates it in place, so there is nothing to copy back.
+#
+# Trade-off: callers share the stored object, so they must not mutate a
+# returned session outside append_event. "app:" / "user:" state keys are kept
+# on the session like any other key (nothing in this project shares them
+# across sessions).
+# =============================================================================
+
+import os                            # os.urandom for generated session ids
+import time                          # time.time() for last_update_time
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+
+class LocalSessionService(BaseSessionService):
+    """
+    🧠 Stores sessions in a plain dict keyed by (app, user, session id) and
+    returns them without copying.
+    """
+
+    def __init__(self):
+        self._sessions: dict[tuple[str, str, str], Session] = {}
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else os.urandom(16).hex()
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        self._sessions[(app_name, user_id, session_id)] = session
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = self._sessions.get((app_name, user_id, session_id))
+        if session is None or config is None:
+            return session
+
+        # A filtered view gets its own (shallow) copy so the stored event list
+        # stays whole; it is a read-only snapshot, not for append_event
+        events = session.events
+        if config.num_recent_events:
+            events = events[-config.num_recent_events:]
+        if config.after_timestamp:
+            events = [e for e in events if e.timestamp >= config.after_timestamp]
+        return session.model_copy(update={"events": events})
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        return ListSessionsResponse(sessions=[
+            Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session.id,
+                last_update_time=session.last_update_time,
+            )
+            for (app, user, _), session in self._sessions.items()
+            if app == app_name and user == user_id
+        ])
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._sessions.pop((app_name, user_id, session_id), None)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        # The base class applies state_delta (skipping temp: keys) and appends
+        # the event to `session`, which is the stored object itself
+        await super().append_event(session=session, event=event)
+        if not event.partial:
+            session.last_update_time = event.timestamp
+        return event
@@ -0,0 +1,44 @@
+# utilities/prewarm.py
+# =============================================================================
+# 🎯 Purpose:
+# Warm up an agent's Gemini client when the server starts, so the first user
+# request doesn't pay for client creation, auth, endpoint resolution and the
+# TLS handshake. Enabled per process with PREWARM=1.
+# =============================================================================
+
+import logging                       # logging is used to record warning/error/info messages
+import os                            # os.getenv for the PREWARM switch
+import time                          # time.monotonic() to report how long warm-up took
+
+from google.adk.agents.llm_agent import LlmAgent
+from google.genai import types
+
+# Create a named logger for this module; __name__ is the module's name
+logger = logging.getLogger(__name__)
+
+
+def prewarm_enabled() -> bool:
+    """True when PREWARM=1 is set."""
+    return os.getenv("PREWARM") == "1"
+
+
+async def prewarm_llm(agent: LlmAgent) -> None:
+    """
+    Send a one-token request through the agent's own Gemini client. Must run
+    on the server's event loop (e.g. a Starlette startup hook) so the warmed
+    connection is the one later requests reuse. Failures are only logged.
+    """
+    started = time.monotonic()
+    try:
+        llm = agent.canonical_model
+        await llm.api_client.aio.models.generate_content(
+            model=llm.model,
+            contents="ping",
+            config=types.GenerateContentConfig(
+                max_output_tokens=1,
+                thinking_config=types.ThinkingConfig(thinking_budget=0),
+            ),
+        )
+        logger.info(f"🔥 Prewarmed {agent.name} Gemini client in {time.monotonic() - started:.2f}s")
+    except Exception as e:
+        logger.warning(f"⚠️ Prewarm of {agent.name} failed after {time.monotonic() - started:.2f}s: {e}")
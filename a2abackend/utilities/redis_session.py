@@ -0,0 +1,193 @@
+# utilities/redis_session.py
+# =============================================================================
+# 🎯 Purpose:
+# A Redis-backed ADK session service, so several replicas of an agent (behind
+# a load balancer) share conversation sessions instead of each keeping its own
+# in-process InMemorySessionService.
+#
+# Layout per session (all keys expire after `ttl` seconds of inactivity):
+#   sess:{app}:{user}:{session}          hash  -> last_update_time
+#   sess:{app}:{user}:{session}:state    hash  -> one JSON-encoded value per state key
+#   sess:{app}:{user}:{session}:events   list  -> one JSON-encoded Event per item
+#   sess_index:{app}:{user}              set   -> session ids, for list_sessions
+# =============================================================================
+
+import json                          # json encodes session state values
+import logging                       # logging is used to record warning/error/info messages
+import os                            # os.urandom for generated session ids
+import time                          # time.time() for last_update_time
+from typing import Any, Optional
+
+import redis.asyncio as redis        # Async Redis client (pip install redis)
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+# Create a named logger for this module; __name__ is the module's name
+logger = logging.getLogger(__name__)
+
+
+class RedisSessionService(BaseSessionService):
+    """
+    🗄️ ADK session service that stores sessions in Redis.
+
+    Every write is a single MULTI/EXEC pipeline, so concurrent requests on
+    different replicas never need a shared in-process lock. State is stored
+    one hash field per key and events write only their state_delta, so two
+    replicas updating different keys of one session don't overwrite each
+    other.
+    """
+
+    def __init__(self, redis_url: str, ttl: int = 24 * 3600):
+        """
+        Args:
+            redis_url (str): e.g. "redis://localhost:6379/0".
+            ttl (int): Seconds a session is kept after its last update.
+        """
+        self.redis = redis.from_url(redis_url)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(app_name: str, user_id: str, session_id: str) -> str:
+        return f"sess:{app_name}:{user_id}:{session_id}"
+
+    @staticmethod
+    def _index_key(app_name: str, user_id: str) -> str:
+        return f"sess_index:{app_name}:{user_id}"
+
+    def _write_state(self, pipe, key: str, state: dict[str, Any]) -> None:
+        """Queue an HSET of the given state keys (one field each) on pipe."""
+        if not state:
+            return
+        pipe.hset(f"{key}:state", mapping={k: json.dumps(v) for k, v in state.items()})
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = (
+            session_id.strip()
+            if session_id and session_id.strip()
+            else os.urandom(16).hex()
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=state or {},
+            last_update_time=time.time(),
+        )
+
+        key = self._key(app_name, user_id, session_id)
+        index_key = self._index_key(app_name, user_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "last_update_time", session.last_update_time)
+            pipe.expire(key, self.ttl)
+            self._write_state(pipe, key, session.state)
+            pipe.expire(f"{key}:state", self.ttl)
+            pipe.sadd(index_key, session_id)
+            pipe.expire(index_key, self.ttl)
+            await pipe.execute()
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = self._key(app_name, user_id, session_id)
+
+        # Only fetch the tail of the event list when fewer events are requested
+        start = -config.num_recent_events if config and config.num_recent_events else 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.hgetall(f"{key}:state")
+            pipe.lrange(f"{key}:events", start, -1)
+            meta, raw_state, raw_events = await pipe.execute()
+        if not meta:
+            return None
+
+        events = [Event.model_validate_json(raw) for raw in raw_events]
+        if config and config.after_timestamp:
+            events = [e for e in events if e.timestamp >= config.after_timestamp]
+
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state={k.decode(): json.loads(v) for k, v in raw_state.items()},
+            events=events,
+            last_update_time=float(meta[b"last_update_time"]),
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        index_key = self._index_key(app_name, user_id)
+        session_ids = [raw_id.decode() for raw_id in await self.redis.smembers(index_key)]
+
+        # One round trip for all sessions instead of one HGET each
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hget(self._key(app_name, user_id, session_id), "last_update_time")
+            last_updates = await pipe.execute()
+
+        sessions = []
+        expired = []
+        for session_id, last_update in zip(session_ids, last_updates):
+            if last_update is None:
+                expired.append(session_id)
+                continue
+            sessions.append(Session(
+                app_name=app_name,
+                user_id=user_id,
+                id=session_id,
+                last_update_time=float(last_update),
+            ))
+        if expired:
+            # Expired; drop them from the index lazily
+            await self.redis.srem(index_key, *expired)
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = self._key(app_name, user_id, session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key, f"{key}:state", f"{key}:events")
+            pipe.srem(self._index_key(app_name, user_id), session_id)
+            await pipe.execute()
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        # Let the base class apply state_delta (skipping temp: keys) and
+        # append to the in-memory session object the Runner is holding
+        await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+
+        # Write only the keys this event changed, never the whole state dict
+        state_delta = {
+            k: v for k, v in (event.actions.state_delta if event.actions else {}).items()
+            if not k.startswith(State.TEMP_PREFIX)
+        }
+
+        key = self._key(session.app_name, session.user_id, session.id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, "last_update_time", session.last_update_time)
+            self._write_state(pipe, key, state_delta)
+            pipe.rpush(f"{key}:events", event.model_dump_json(exclude_none=True))
+            pipe.expire(key, self.ttl)
+            pipe.expire(f"{key}:state", self.ttl)
+            pipe.expire(f"{key}:events", self.ttl)
+            await pipe.execute()
+        return event
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()